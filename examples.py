@@ -49,9 +49,9 @@ def main():
         "INSERT INTO users (id, name, age) VALUES (5, 'Eve', 22)",
     ]
     
-    for sql in users_data:
+    # execute_many runs consecutive INSERTs into the same table as one batch
+    for sql, result in zip(users_data, engine.execute_many(users_data)):
         print(f"SQL: {sql}")
-        result = engine.execute(sql)
         print(result)
     
     # Insert products
@@ -64,9 +64,8 @@ def main():
         "INSERT INTO products (id, name, price, stock) VALUES (5, 'Headphones', 150, 20)",
     ]
     
-    for sql in products_data:
+    for sql, result in zip(products_data, engine.execute_many(products_data)):
         print(f"SQL: {sql}")
-        result = engine.execute(sql)
         print(result)
     
     # ========================================================================
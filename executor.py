@@ -4,12 +4,101 @@ This module takes the AST from the parser and executes it against the storage en
 It handles the actual data manipulation and retrieval.
 """
 
-from typing import List, Dict, Any, Union
+import math
+import operator
+import os
+from array import array
+from collections import OrderedDict
+from types import CodeType
+from typing import List, Dict, Any, Callable, Hashable, Optional, Sequence, Tuple, Union
 from parser import (
     SelectStatement, InsertStatement, CreateTableStatement,
     WhereClause, Condition, CompoundCondition
 )
-from storage import StorageEngine
+from storage import StorageEngine, Table, INT_MIN, INT_MAX
+
+
+# Comparison operators as they are spelled in generated Python code
+OPERATOR_SOURCE = {
+    '=': '==',
+    '>': '>',
+    '<': '<',
+    '>=': '>=',
+    '<=': '<=',
+    '!=': '!=',
+}
+
+# Comparison operators as functions, used by predicates built without codegen
+OPERATOR_FUNCTIONS = {
+    '=': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+}
+
+# Estimated fraction of rows each comparison keeps, used to order AND/OR terms
+SELECTIVITY = {
+    '=': 0.1,
+    '>': 0.33,
+    '<': 0.33,
+    '>=': 0.33,
+    '<=': 0.33,
+    '!=': 0.9,
+}
+
+# A compiled WHERE clause: takes a table, a selection vector (row ids, or None
+# for every row) and optionally a column name. Returns the ids of the rows that
+# match or, given a column, that column's values in the rows that match
+Predicate = Callable[..., List[Any]]
+
+# Maximum number of compiled WHERE clauses kept by each executor
+PREDICATE_CACHE_SIZE = 512
+
+# Tables with fewer rows than this are filtered with a bound predicate (see
+# Executor.bind_where) unless the clause is already compiled: generating and
+# compiling code would cost more than the scan saves. Compiling takes about
+# as long as binding and scanning 50-100 rows when a clause of the same shape
+# was compiled before, and several hundred rows otherwise. Can be overridden
+# with the SQL_ENGINE_BIND_ROWS environment variable (0 always compiles)
+BIND_ROW_THRESHOLD = int(os.environ.get('SQL_ENGINE_BIND_ROWS', 64))
+
+# Source of the function generated for a WHERE clause (see compile_where)
+PREDICATE_TEMPLATE = """\
+def predicate(table, selection, column=None):
+    missing = table.missing_columns
+{missing_checks}\
+    data = table.column_data
+{column_loads}\
+    if selection is None:
+        source = range(table.row_count) if column is None else data[column]
+        return [x for x, {row_vars} in zip(source, {columns}) if {condition}]
+    source = selection if column is None else map(data[column].__getitem__, selection)
+    return [x for x, {row_vars} in zip(source, {gathers}) if {condition}]
+"""
+
+# Source generated for a WHERE clause that no row can satisfy: the table's
+# columns are checked as usual, but no row is looked at
+EMPTY_PREDICATE_TEMPLATE = """\
+def predicate(table, selection, column=None):
+    missing = table.missing_columns
+{missing_checks}\
+    return []
+"""
+
+
+def where_key(where: WhereClause) -> Hashable:
+    """
+    Build a hashable signature for a WHERE clause.
+    
+    Two clauses with the same signature compile to the same predicate, so the
+    signature is used as the predicate cache key. The literal's type is part
+    of the key so that e.g. 1 and 1.0 are kept apart.
+    """
+    if isinstance(where, Condition):
+        return (where.column, where.operator, type(where.value), where.value)
+    return (where.operator, where_key(where.left), where_key(where.right))
 
 
 class QueryResult:
@@ -18,49 +107,82 @@ class QueryResult:
     
     Contains:
     - columns: List of column names
-    - rows: List of row data (each row is a dictionary)
+    - column_data: Result values stored column by column
     - rows_affected: Number of rows affected (for INSERT, UPDATE, DELETE)
+    
+    Row dictionaries are only built on demand (see `rows`), so a SELECT never
+    has to convert its columnar result back into rows unless asked to.
     """
     
     def __init__(self, columns: List[str] = None, rows: List[Dict[str, Any]] = None, 
-                 rows_affected: int = 0, message: str = None):
+                 rows_affected: int = 0, message: str = None,
+                 column_data: Dict[str, Sequence[Any]] = None):
         self.columns = columns or []
-        self.rows = rows or []
+        if column_data is None:
+            column_data = {
+                col: [row.get(col) for row in rows or []]
+                for col in self.columns
+            }
+        self.column_data = column_data
         self.rows_affected = rows_affected
         self.message = message
     
+    @classmethod
+    def from_columns(cls, columns: List[str], column_data: Dict[str, Sequence[Any]]) -> 'QueryResult':
+        """
+        Build a result directly from column values.
+        
+        Args:
+            columns: Column names, in output order
+            column_data: One sequence of values per column, all the same length
+            
+        Returns:
+            QueryResult holding the columns as given, without copying them
+        """
+        return cls(columns=columns, column_data=column_data)
+    
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the result"""
+        if not self.columns:
+            return 0
+        return len(self.column_data[self.columns[0]])
+    
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """The result as a list of row dictionaries"""
+        return [
+            dict(zip(self.columns, values))
+            for values in zip(*(self.column_data[col] for col in self.columns))
+        ]
+    
     def __str__(self) -> str:
         """Format the result as a readable string"""
         if self.message:
             return self.message
         
-        if not self.rows:
+        row_count = self.row_count
+        if not row_count:
             return f"({self.rows_affected} rows affected)"
         
-        # Calculate column widths for pretty printing
-        col_widths = {}
+        # Convert each column to strings once, then pad it to its width
+        padded = []
+        widths = []
         for col in self.columns:
-            col_widths[col] = len(col)
-        
-        for row in self.rows:
-            for col in self.columns:
-                value_str = str(row.get(col, ''))
-                col_widths[col] = max(col_widths[col], len(value_str))
+            values = list(map(str, self.column_data[col]))
+            width = max(len(col), max(map(len, values)))
+            padded.append([value.ljust(width) for value in values])
+            widths.append(width)
         
         # Build header
-        header = ' | '.join(col.ljust(col_widths[col]) for col in self.columns)
-        separator = '-+-'.join('-' * col_widths[col] for col in self.columns)
+        header = ' | '.join(col.ljust(width) for col, width in zip(self.columns, widths))
+        separator = '-+-'.join('-' * width for width in widths)
         
         # Build rows
         result_lines = [header, separator]
-        for row in self.rows:
-            row_str = ' | '.join(
-                str(row.get(col, '')).ljust(col_widths[col]) 
-                for col in self.columns
-            )
-            result_lines.append(row_str)
+        result_lines.extend(map(' | '.join, zip(*padded)))
         
-        result_lines.append(f"\n({len(self.rows)} rows)")
+        result_lines.append(f"\n({row_count} rows)")
         return '\n'.join(result_lines)
 
 
@@ -82,6 +204,10 @@ class Executor:
             storage: The storage engine to execute queries against
         """
         self.storage = storage
+        # Compiled WHERE predicates keyed by where_key(), least recently used first
+        self.predicate_cache: 'OrderedDict[Hashable, Predicate]' = OrderedDict()
+        # Compiled code of generated predicates keyed by their source text
+        self.code_cache: 'OrderedDict[str, CodeType]' = OrderedDict()
     
     def execute(self, statement: Union[SelectStatement, InsertStatement, CreateTableStatement]) -> QueryResult:
         """
@@ -112,7 +238,7 @@ class Executor:
         Returns:
             QueryResult with a success message
         """
-        self.storage.create_table(statement.table, statement.columns)
+        self.storage.create_table(statement.table, list(statement.columns))
         return QueryResult(message=f"Table '{statement.table}' created successfully")
     
     def execute_insert(self, statement: InsertStatement) -> QueryResult:
@@ -125,11 +251,37 @@ class Executor:
         Returns:
             QueryResult with the number of rows affected
         """
-        # Build a row dictionary from columns and values
-        row = dict(zip(statement.columns, statement.values))
+        # Values stay positional; the table maps them to columns once per statement
+        self.storage.insert_rows(statement.table, statement.columns, statement.values)
+        return self.insert_result(statement)
+    
+    def execute_insert_many(self, statements: List[InsertStatement]) -> List[QueryResult]:
+        """
+        Execute several INSERT statements into the same table as one batch.
+        
+        All rows go through a single storage call, so the table is validated
+        and saved once. If any row is invalid, nothing is inserted. If the
+        rows cannot be written to disk, they are removed from the table again
+        (see StorageEngine.commit_rows), so again nothing is inserted.
         
-        self.storage.insert_row(statement.table, row)
-        return QueryResult(rows_affected=1, message=f"1 row inserted into '{statement.table}'")
+        Args:
+            statements: INSERT AST nodes, all with the same table and columns
+            
+        Returns:
+            One QueryResult per statement
+        """
+        first = statements[0]
+        value_rows = [values for statement in statements for values in statement.values]
+        self.storage.insert_rows(first.table, first.columns, value_rows)
+        return [self.insert_result(statement) for statement in statements]
+    
+    def insert_result(self, statement: InsertStatement) -> QueryResult:
+        """Build the result reported for a successful INSERT statement"""
+        count = len(statement.values)
+        if count == 1:
+            return QueryResult(rows_affected=1, message=f"1 row inserted into '{statement.table}'")
+        return QueryResult(rows_affected=count,
+                           message=f"{count} rows inserted into '{statement.table}'")
     
     def execute_select(self, statement: SelectStatement) -> QueryResult:
         """
@@ -140,6 +292,10 @@ class Executor:
         2. Filtering rows based on WHERE clause (if present)
         3. Projecting only the requested columns
         
+        The table is stored column by column, so filtering only reads the
+        columns referenced by the WHERE clause and projection only reads the
+        selected columns. Columns used by neither are never touched.
+        
         Args:
             statement: The SELECT AST node
             
@@ -151,90 +307,439 @@ class Executor:
         if not table:
             raise ValueError(f"Table '{statement.table}' does not exist")
         
-        # Start with all rows
-        rows = table.rows.copy()
-        
-        # Apply WHERE clause filtering if present
-        if statement.where:
-            rows = [row for row in rows if self.evaluate_where(row, statement.where)]
-        
         # Determine which columns to return
         if statement.columns == ['*']:
             columns = table.get_column_names()
         else:
-            columns = statement.columns
+            # A copy: the result hands its column list to the caller, and the
+            # statement may be a cached AST that is executed again
+            columns = list(statement.columns)
             # Validate that requested columns exist
-            table_columns = table.get_column_names()
             for col in columns:
-                if col not in table_columns:
+                if col not in table.column_data:
                     raise ValueError(f"Column '{col}' does not exist in table '{statement.table}'")
         
-        # Project only the requested columns
-        projected_rows = []
-        for row in rows:
-            projected_row = {col: row.get(col) for col in columns}
-            projected_rows.append(projected_row)
+        # Apply WHERE clause filtering if present. The predicate only reads
+        # the columns the WHERE clause references. A single output column is
+        # filtered and projected in the same pass
+        selection = None
+        if statement.where:
+            predicate = self.get_predicate(table, statement.where)
+            # An index narrows the rows the predicate has to look at; the
+            # predicate still checks every term on the rows that remain
+            candidates = self.index_selection(table, statement.where) if table.indexes else None
+            output = list(dict.fromkeys(columns))
+            if len(output) == 1:
+                values = predicate(table, candidates, output[0])
+                return QueryResult.from_columns(columns, {output[0]: values})
+            selection = predicate(table, candidates)
+            if len(selection) == table.row_count:
+                selection = None
         
-        return QueryResult(columns=columns, rows=projected_rows)
+        # Project the requested columns, reading each distinct column once:
+        # one gather per column, or one copy when every row is selected.
+        # Slicing copies the whole buffer at once (a memory copy for packed
+        # INT columns), so the result no longer aliases the table
+        if selection is None:
+            column_data = {col: table.column_data[col][:] for col in dict.fromkeys(columns)}
+        elif not selection:
+            column_data = {col: [] for col in dict.fromkeys(columns)}
+        else:
+            column_data = {
+                col: list(map(table.column_data[col].__getitem__, selection))
+                for col in dict.fromkeys(columns)
+            }
+        
+        return QueryResult.from_columns(columns, column_data)
     
-    def evaluate_where(self, row: Dict[str, Any], where: WhereClause) -> bool:
+    def get_predicate(self, table: Table, where: WhereClause) -> Predicate:
         """
-        Evaluate a WHERE clause against a row.
+        Get the compiled predicate for a WHERE clause, compiling it on a miss.
         
-        This recursively evaluates compound conditions (AND/OR) and
-        simple conditions (comparisons).
+        Repeated queries with the same WHERE clause on the same table reuse
+        the predicate from the cache instead of compiling it again. On a miss
+        against a small table (under BIND_ROW_THRESHOLD rows) the clause is
+        bound instead of compiled, and the result is not cached.
         
         Args:
-            row: The row to evaluate
+            table: The table the clause is evaluated against
             where: The WHERE clause AST node
             
         Returns:
-            True if the row matches the condition, False otherwise
+            A predicate function for the clause
+        """
+        key = (table.name, where_key(where))
+        predicate = self.predicate_cache.get(key)
+        if predicate is None:
+            if table.row_count < BIND_ROW_THRESHOLD:
+                return self.bind_where(table, where)
+            predicate = self.compile_where(table, where)
+            self.predicate_cache[key] = predicate
+            if len(self.predicate_cache) > PREDICATE_CACHE_SIZE:
+                self.predicate_cache.popitem(last=False)
+        else:
+            self.predicate_cache.move_to_end(key)
+        return predicate
+    
+    def compile_where(self, table: Table, where: WhereClause) -> Predicate:
+        """
+        Compile a WHERE clause into a predicate function.
+        
+        The clause is turned into Python source for a single list
+        comprehension, which is compiled once with `compile()`/`exec()`. For
+        example, `age > 18 AND name = 'Bob'` becomes roughly:
+        
+            [i for i, v0, v1 in zip(selection, age, name) if v1 == k0 and v0 >= k1]
+        
+        Running it walks the referenced columns once, in the interpreter's
+        specialized comparison instructions, with no AST walk, no function
+        call per condition and with AND/OR short-circuiting per row.
+        
+        While generating the source:
+        - AND/OR chains are flattened and their terms reordered by estimated
+          selectivity, so rows are rejected (AND) or accepted (OR) as early
+          as possible.
+        - Comparisons of an INT column with a numeric literal are rewritten as
+          integer bounds. Bounds on the same column within an AND chain are
+          intersected into one chained comparison (low <= v0 < high), and a
+          decimal literal is converted to an integer once, not per row.
+        - Terms that can never hold (an empty range such as age > 5 AND
+          age < 3) are folded away: they end an AND chain and are dropped from
+          an OR chain. A clause that folds to False does not scan at all.
+        
+        The predicate takes a table and a selection vector (row ids to
+        consider, or None for every row) and returns the ids of the matching
+        rows, in table order. Given a column name as well, it returns that
+        column's values in the matching rows instead, reading the column
+        in the same comprehension as the filter. It is specialized to the table's schema, so it
+        must only be run against that table.
+        
+        Args:
+            table: The table whose schema the clause is compiled against
+            where: The WHERE clause AST node
+            
+        Returns:
+            A predicate function for the clause
+        """
+        variables = {}  # column name -> name of its per-row variable
+        constants = {}  # constant name -> literal value
+        condition = self.where_source(table, where, variables, constants)
+        
+        names = list(variables)
+        row_vars = ', '.join(variables[name] for name in names)
+        template = EMPTY_PREDICATE_TEMPLATE if condition == 'False' else PREDICATE_TEMPLATE
+        source = template.format(
+            missing_checks=''.join(
+                f"    if {name!r} in missing:\n"
+                f"        raise ValueError({f'Column {name!r} not found in row'!r})\n"
+                for name in names
+            ),
+            column_loads=''.join(
+                f"    c{index} = data[{name!r}]\n" for index, name in enumerate(names)
+            ),
+            row_vars=row_vars,
+            columns=', '.join(f"c{index}" for index in range(len(names))),
+            gathers=', '.join(
+                f"map(c{index}.__getitem__, selection)" for index in range(len(names))
+            ),
+            condition=condition,
+        )
+        
+        # Clauses that differ only in their literals generate the same source,
+        # so the compiled code is reused and only the constants change
+        code = self.code_cache.get(source)
+        if code is None:
+            code = compile(source, '<where>', 'exec')
+            self.code_cache[source] = code
+            if len(self.code_cache) > PREDICATE_CACHE_SIZE:
+                self.code_cache.popitem(last=False)
+        else:
+            self.code_cache.move_to_end(source)
+        
+        namespace = dict(constants)
+        exec(code, namespace)
+        return namespace['predicate']
+    
+    def bind_where(self, table: Table, where: WhereClause) -> Predicate:
+        """
+        Build a predicate for a WHERE clause without generating code.
+        
+        Each comparison is bound once to its column buffer, its literal and
+        the C implementation of its operator from OPERATOR_FUNCTIONS, so a
+        row is tested by calling a few small closures. Conditions are tested
+        in the order they were written. Building the predicate is much cheaper than
+        compile_where, but testing each row costs more.
+        
+        Args:
+            table: The table the clause is evaluated against
+            where: The WHERE clause AST node
+            
+        Returns:
+            A predicate function for the clause, with the same contract as
+            the ones built by compile_where
+        """
+        referenced = {}  # column name -> None, in order of first reference
+        test = self.bind_condition(table, where, referenced)
+        for name in referenced:
+            if name in table.missing_columns:
+                raise ValueError(f"Column '{name}' not found in row")
+        
+        def predicate(table: Table, selection: Optional[Sequence[int]],
+                      column: Optional[str] = None) -> List[Any]:
+            if selection is None:
+                selection = range(table.row_count)
+            if column is None:
+                return list(filter(test, selection))
+            return list(map(table.column_data[column].__getitem__, filter(test, selection)))
+        
+        return predicate
+    
+    def bind_condition(self, table: Table, where: WhereClause,
+                       referenced: Dict[str, None]) -> Callable[[int], bool]:
+        """
+        Bind a WHERE clause to a function testing a single row id.
+        
+        Args:
+            table: The table the clause is evaluated against
+            where: The WHERE clause AST node
+            referenced: Filled in with the names of the columns the clause uses
+            
+        Returns:
+            A function taking a row id and returning whether the row matches
         """
         if isinstance(where, Condition):
-            return self.evaluate_condition(row, where)
+            if where.operator not in OPERATOR_FUNCTIONS:
+                raise ValueError(f"Unknown operator: {where.operator}")
+            if where.column not in table.column_index:
+                raise ValueError(f"Column '{where.column}' does not exist in table '{table.name}'")
+            referenced[where.column] = None
+            
+            compare = OPERATOR_FUNCTIONS[where.operator]
+            values = table.column_data[where.column]
+            value = where.value
+            return lambda i: compare(values[i], value)
         elif isinstance(where, CompoundCondition):
-            left_result = self.evaluate_where(row, where.left)
-            right_result = self.evaluate_where(row, where.right)
+            left = self.bind_condition(table, where.left, referenced)
+            right = self.bind_condition(table, where.right, referenced)
+            if where.operator == 'AND':
+                return lambda i: left(i) and right(i)
+            elif where.operator == 'OR':
+                return lambda i: left(i) or right(i)
+            else:
+                raise ValueError(f"Unknown logical operator: {where.operator}")
+        else:
+            raise ValueError(f"Unknown WHERE clause type: {type(where)}")
+    
+    def where_source(self, table: Table, where: WhereClause,
+                     variables: Dict[str, str], constants: Dict[str, Any]) -> str:
+        """
+        Generate the Python expression for a WHERE clause.
+        
+        Args:
+            table: The table whose schema the clause is compiled against
+            where: The WHERE clause AST node
+            variables: Column name -> per-row variable name, filled in as
+                columns are referenced
+            constants: Constant name -> literal value, filled in as literals
+                are referenced
+            
+        Returns:
+            A Python boolean expression over the per-row variables
+        """
+        if isinstance(where, Condition):
+            if where.operator not in OPERATOR_SOURCE:
+                raise ValueError(f"Unknown operator: {where.operator}")
+            if where.column not in table.column_index:
+                raise ValueError(f"Column '{where.column}' does not exist in table '{table.name}'")
+            
+            variable = variables.setdefault(where.column, f"v{len(variables)}")
+            bounds = self.int_bounds(table, where)
+            if bounds is not None:
+                return self.range_source(variable, *bounds, constants)
             
+            constant = self.constant_source(where.value, constants)
+            return f"{variable} {OPERATOR_SOURCE[where.operator]} {constant}"
+        elif isinstance(where, CompoundCondition):
+            terms = self.flatten_compound(where)
             if where.operator == 'AND':
-                return left_result and right_result
+                parts = self.and_terms_source(table, terms, variables, constants)
+                if 'False' in parts:
+                    return 'False'
+                return '(' + ' and '.join(parts) + ')'
             elif where.operator == 'OR':
-                return left_result or right_result
+                # Least selective terms first: they accept rows the soonest
+                terms.sort(key=self.estimate_selectivity, reverse=True)
+                parts = [self.where_source(table, term, variables, constants) for term in terms]
+                parts = [part for part in parts if part != 'False']
+                if not parts:
+                    return 'False'
+                return '(' + ' or '.join(parts) + ')'
             else:
                 raise ValueError(f"Unknown logical operator: {where.operator}")
         else:
             raise ValueError(f"Unknown WHERE clause type: {type(where)}")
     
-    def evaluate_condition(self, row: Dict[str, Any], condition: Condition) -> bool:
+    def and_terms_source(self, table: Table, terms: List[WhereClause],
+                         variables: Dict[str, str], constants: Dict[str, Any]) -> List[str]:
+        """
+        Generate the expressions for the terms of an AND chain.
+        
+        Range and equality comparisons against the same INT column are fused:
+        their bounds are intersected, so age > 18 AND age < 65 becomes the
+        single chained comparison k0 <= v0 < k1.
+        
+        Returns:
+            One expression per term, most selective first
+        """
+        parts = []      # (estimated selectivity, expression) pairs
+        int_terms = {}  # column name -> range-able conditions on it
+        for term in terms:
+            if self.int_bounds(table, term) is not None:
+                int_terms.setdefault(term.column, []).append(term)
+            else:
+                parts.append((self.estimate_selectivity(term),
+                              self.where_source(table, term, variables, constants)))
+        
+        for name, conditions in int_terms.items():
+            low, high = INT_MIN, INT_MAX + 1
+            selectivity = 1.0
+            for condition in conditions:
+                term_low, term_high = self.int_bounds(table, condition)
+                low, high = max(low, term_low), min(high, term_high)
+                selectivity *= self.estimate_selectivity(condition)
+            variable = variables.setdefault(name, f"v{len(variables)}")
+            parts.append((selectivity, self.range_source(variable, low, high, constants)))
+        
+        # Most selective terms first: they reject rows the soonest
+        parts.sort(key=lambda part: part[0])
+        return [expression for _, expression in parts]
+    
+    def range_source(self, variable: str, low: int, high: int, constants: Dict[str, Any]) -> str:
+        """Generate the expression testing low <= variable < high"""
+        if low >= high:
+            return 'False'
+        if high - low == 1:
+            return f"{variable} == {self.constant_source(low, constants)}"
+        if low == INT_MIN:
+            return f"{variable} < {self.constant_source(high, constants)}"
+        if high == INT_MAX + 1:
+            return f"{variable} >= {self.constant_source(low, constants)}"
+        return (f"{self.constant_source(low, constants)} <= {variable} "
+                f"< {self.constant_source(high, constants)}")
+    
+    def constant_source(self, value: Any, constants: Dict[str, Any]) -> str:
+        """
+        Register a literal for the generated code and return its name.
+        
+        Literals are passed to the generated function as global names rather
+        than pasted into the source, so no value can change the code.
+        """
+        name = f"k{len(constants)}"
+        constants[name] = value
+        return name
+    
+    def int_bounds(self, table: Table, where: WhereClause) -> Optional[Tuple[int, int]]:
+        """
+        Express a comparison on an INT column as a half-open integer range.
+        
+        Example: age > 18 becomes (19, INT_MAX + 1), age <= 2.5 becomes
+        (INT_MIN, 3).
+        
+        Returns:
+            (low, high) such that the condition holds exactly for integers in
+            range(low, high), or None if the condition is not such a
+            comparison (not an INT column, != or a non-numeric literal)
         """
-        Evaluate a single comparison condition.
+        if not isinstance(where, Condition) or where.column not in table.column_index:
+            return None
+        if table.columns[table.column_index[where.column]].data_type != 'INT':
+            return None
+        # The bounds are clamped to the 64-bit range, which only holds every
+        # value of a packed column; a column stored as a list may hold larger
+        # integers (see Table.unpack), or None, which fails the missing check
+        if not isinstance(table.column_data[where.column], array):
+            return None
+        
+        value = where.value
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return None
+        elif not isinstance(value, int):
+            return None
+        
+        if where.operator == '=':
+            if value != int(value):
+                return (0, 0)
+            return (int(value), int(value) + 1)
+        elif where.operator == '>':
+            return (math.floor(value) + 1, INT_MAX + 1)
+        elif where.operator == '>=':
+            return (math.ceil(value), INT_MAX + 1)
+        elif where.operator == '<':
+            return (INT_MIN, math.ceil(value))
+        elif where.operator == '<=':
+            return (INT_MIN, math.floor(value) + 1)
+        return None
+    
+    def index_selection(self, table: Table, where: WhereClause) -> Optional[Sequence[int]]:
+        """
+        Use the table's hash indexes to find the rows a WHERE clause can match.
+        
+        Only equality terms on indexed columns that must hold for a row to
+        match (the clause itself, or a term of a top-level AND) are used. When
+        there are several, the one matching the fewest rows is picked.
         
         Args:
-            row: The row to evaluate
-            condition: The condition to check
+            table: The table the clause is evaluated against
+            where: The WHERE clause AST node
             
         Returns:
-            True if the condition is met, False otherwise
+            Ids of the candidate rows in ascending order, or None if no index
+            applies and every row has to be scanned
         """
-        # Get the column value from the row
-        if condition.column not in row:
-            raise ValueError(f"Column '{condition.column}' not found in row")
+        if isinstance(where, Condition):
+            terms = [where]
+        elif where.operator == 'AND':
+            terms = self.flatten_compound(where)
+        else:
+            return None
         
-        row_value = row[condition.column]
-        compare_value = condition.value
+        candidates = None
+        for term in terms:
+            if (isinstance(term, Condition) and term.operator == '='
+                    and term.column in table.indexes):
+                rows = table.probe(term.column, term.value)
+                if candidates is None or len(rows) < len(candidates):
+                    candidates = rows
+        return candidates
+    
+    def flatten_compound(self, where: CompoundCondition) -> List[WhereClause]:
+        """
+        Flatten a chain of compound conditions that share the same operator.
         
-        # Perform the comparison based on the operator
-        operator_map = {
-            '=': lambda a, b: a == b,
-            '>': lambda a, b: a > b,
-            '<': lambda a, b: a < b,
-            '>=': lambda a, b: a >= b,
-            '<=': lambda a, b: a <= b,
-            '!=': lambda a, b: a != b,
-        }
+        Example: (a AND b) AND c becomes [a, b, c]. Sub-trees joined by a
+        different operator are kept whole.
+        """
+        terms = []
+        for side in (where.left, where.right):
+            if isinstance(side, CompoundCondition) and side.operator == where.operator:
+                terms.extend(self.flatten_compound(side))
+            else:
+                terms.append(side)
+        return terms
+    
+    def estimate_selectivity(self, where: WhereClause) -> float:
+        """
+        Estimate the fraction of rows a condition keeps.
         
-        if condition.operator not in operator_map:
-            raise ValueError(f"Unknown operator: {condition.operator}")
+        This is a static guess based only on the operators involved: equality
+        keeps few rows, ranges keep about a third, inequality keeps most.
+        """
+        if isinstance(where, Condition):
+            return SELECTIVITY.get(where.operator, 1.0)
         
-        return operator_map[condition.operator](row_value, compare_value)
+        left = self.estimate_selectivity(where.left)
+        right = self.estimate_selectivity(where.right)
+        if where.operator == 'AND':
+            return left * right
+        return 1.0 - (1.0 - left) * (1.0 - right)
@@ -7,7 +7,7 @@ into meaningful pieces (tokens) like keywords, identifiers, operators, etc.
 import re
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List
 
 
 class TokenType(Enum):
@@ -50,7 +50,7 @@ class TokenType(Enum):
     EOF = auto()         # End of file/statement
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """Represents a single token with its type and value"""
     type: TokenType
@@ -67,6 +67,10 @@ class Lexer:
     - Identifiers (table and column names)
     - String and numeric literals
     - Operators and punctuation
+    
+    The whole statement is scanned with a single compiled regular expression,
+    one alternative per token class, so the character-level matching runs in
+    the regex engine rather than in a Python loop.
     """
     
     # Map of keyword strings to their token types
@@ -85,6 +89,48 @@ class Lexer:
         'OR': TokenType.OR,
     }
     
+    # Map of operator and delimiter strings to their token types
+    OPERATORS = {
+        '>=': TokenType.GREATER_EQ,
+        '<=': TokenType.LESS_EQ,
+        '!=': TokenType.NOT_EQ,
+        '=': TokenType.EQUALS,
+        '>': TokenType.GREATER,
+        '<': TokenType.LESS,
+        '(': TokenType.LPAREN,
+        ')': TokenType.RPAREN,
+        ',': TokenType.COMMA,
+        ';': TokenType.SEMICOLON,
+        '*': TokenType.STAR,
+    }
+    
+    # Keywords as they are usually spelled, mapped to (keyword, token type)
+    KEYWORD_SPELLINGS = {
+        spelling: (keyword, token_type)
+        for keyword, token_type in KEYWORDS.items()
+        for spelling in (keyword, keyword.lower(), keyword.capitalize())
+    }
+    
+    # One named group per token class, tried in order at each position.
+    # Whitespace before a token is skipped as part of the same match, so
+    # each match yields a token. Two-character operators come before the
+    # single-character ones, UNTERMINATED and UNKNOWN catch an unterminated
+    # string or any other character, and END matches trailing whitespace.
+    # STRING captures a string's contents so the token value is sliced from
+    # the SQL text once, without the quotes.
+    TOKEN_PATTERN = re.compile(r"""
+        \s*
+        (?:
+          (?P<WORD>[^\W\d]\w*)
+        | (?P<OPERATOR>>=|<=|!=|[=<>(),;*])
+        | (?P<NUMBER>\d[\d.]*)
+        | '(?P<STRING>[^']*)'
+        | (?P<UNTERMINATED>')
+        | (?P<UNKNOWN>\S)
+        | (?P<END>\Z)
+        )
+    """, re.VERBOSE)
+    
     def __init__(self, sql: str):
         """
         Initialize the lexer with SQL text.
@@ -93,85 +139,6 @@ class Lexer:
             sql: The SQL statement to tokenize
         """
         self.sql = sql
-        self.position = 0
-        self.current_char = self.sql[0] if sql else None
-    
-    def advance(self):
-        """Move to the next character in the SQL string"""
-        self.position += 1
-        if self.position >= len(self.sql):
-            self.current_char = None
-        else:
-            self.current_char = self.sql[self.position]
-    
-    def peek(self, offset: int = 1) -> Optional[str]:
-        """Look ahead at the next character without consuming it"""
-        peek_pos = self.position + offset
-        if peek_pos >= len(self.sql):
-            return None
-        return self.sql[peek_pos]
-    
-    def skip_whitespace(self):
-        """Skip over whitespace characters"""
-        while self.current_char and self.current_char.isspace():
-            self.advance()
-    
-    def read_number(self) -> Token:
-        """
-        Read a numeric literal from the input.
-        Supports integers and decimals.
-        """
-        start_pos = self.position
-        num_str = ''
-        
-        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
-            num_str += self.current_char
-            self.advance()
-        
-        # Convert to appropriate numeric type
-        value = float(num_str) if '.' in num_str else int(num_str)
-        return Token(TokenType.NUMBER, value, start_pos)
-    
-    def read_string(self) -> Token:
-        """
-        Read a string literal enclosed in single quotes.
-        Example: 'Hello World'
-        """
-        start_pos = self.position
-        self.advance()  # Skip opening quote
-        
-        string_value = ''
-        while self.current_char and self.current_char != "'":
-            string_value += self.current_char
-            self.advance()
-        
-        if self.current_char == "'":
-            self.advance()  # Skip closing quote
-        else:
-            raise ValueError(f"Unterminated string at position {start_pos}")
-        
-        return Token(TokenType.STRING, string_value, start_pos)
-    
-    def read_identifier(self) -> Token:
-        """
-        Read an identifier (table name, column name) or keyword.
-        Identifiers start with a letter or underscore and can contain letters, digits, and underscores.
-        """
-        start_pos = self.position
-        identifier = ''
-        
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            identifier += self.current_char
-            self.advance()
-        
-        # Check if this identifier is actually a keyword
-        identifier_upper = identifier.upper()
-        token_type = self.KEYWORDS.get(identifier_upper, TokenType.IDENTIFIER)
-        
-        # For keywords, store the uppercase version; for identifiers, keep original case
-        value = identifier_upper if token_type != TokenType.IDENTIFIER else identifier
-        
-        return Token(token_type, value, start_pos)
     
     def tokenize(self) -> List[Token]:
         """
@@ -181,70 +148,57 @@ class Lexer:
             List of tokens representing the SQL statement
         """
         tokens = []
+        append = tokens.append
+        keyword_spellings = self.KEYWORD_SPELLINGS
+        operators = self.OPERATORS
         
-        while self.current_char:
-            # Skip whitespace
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-            
-            # Numbers
-            if self.current_char.isdigit():
-                tokens.append(self.read_number())
-                continue
+        # Token classes are checked from the most to the least common
+        for match in self.TOKEN_PATTERN.finditer(self.sql):
+            kind = match.lastgroup
+            text = match.group(kind)
+            pos = match.start(kind)
             
-            # Strings (single-quoted)
-            if self.current_char == "'":
-                tokens.append(self.read_string())
-                continue
-            
-            # Identifiers and keywords
-            if self.current_char.isalpha() or self.current_char == '_':
-                tokens.append(self.read_identifier())
-                continue
+            # Identifiers and keywords. For keywords, store the uppercase
+            # version; for identifiers, keep original case. A word spelled
+            # all in ASCII lowercase or uppercase that is not a known
+            # spelling cannot be a keyword, so only other words are
+            # uppercased to check
+            if kind == 'WORD':
+                spelled = keyword_spellings.get(text)
+                if spelled is None and not (text.isascii() and (text.islower() or text.isupper())):
+                    keyword = text.upper()
+                    token_type = self.KEYWORDS.get(keyword)
+                    if token_type is not None:
+                        spelled = (keyword, token_type)
+                if spelled is None:
+                    append(Token(TokenType.IDENTIFIER, text, pos))
+                else:
+                    append(Token(spelled[1], spelled[0], pos))
             
             # Operators and punctuation
-            pos = self.position
-            
-            # Two-character operators
-            if self.current_char == '>' and self.peek() == '=':
-                tokens.append(Token(TokenType.GREATER_EQ, '>=', pos))
-                self.advance()
-                self.advance()
-                continue
+            elif kind == 'OPERATOR':
+                append(Token(operators[text], text, pos))
             
-            if self.current_char == '<' and self.peek() == '=':
-                tokens.append(Token(TokenType.LESS_EQ, '<=', pos))
-                self.advance()
-                self.advance()
-                continue
+            # Numbers: integers and decimals
+            elif kind == 'NUMBER':
+                value = float(text) if '.' in text else int(text)
+                append(Token(TokenType.NUMBER, value, pos))
             
-            if self.current_char == '!' and self.peek() == '=':
-                tokens.append(Token(TokenType.NOT_EQ, '!=', pos))
-                self.advance()
-                self.advance()
-                continue
+            # Strings (single-quoted), stored without the quotes. The token
+            # starts at the opening quote
+            elif kind == 'STRING':
+                append(Token(TokenType.STRING, text, pos - 1))
             
-            # Single-character operators and delimiters
-            char_map = {
-                '=': TokenType.EQUALS,
-                '>': TokenType.GREATER,
-                '<': TokenType.LESS,
-                '(': TokenType.LPAREN,
-                ')': TokenType.RPAREN,
-                ',': TokenType.COMMA,
-                ';': TokenType.SEMICOLON,
-                '*': TokenType.STAR,
-            }
-            
-            if self.current_char in char_map:
-                tokens.append(Token(char_map[self.current_char], self.current_char, pos))
-                self.advance()
-                continue
+            elif kind == 'UNTERMINATED':
+                raise ValueError(f"Unterminated string at position {pos}")
             
             # Unknown character
-            raise ValueError(f"Unexpected character '{self.current_char}' at position {pos}")
+            elif kind == 'UNKNOWN':
+                raise ValueError(f"Unexpected character '{text}' at position {pos}")
+            
+            else:
+                break
         
         # Add EOF token
-        tokens.append(Token(TokenType.EOF, None, self.position))
+        tokens.append(Token(TokenType.EOF, None, len(self.sql)))
         return tokens
@@ -4,14 +4,39 @@ The parser takes the tokens from the lexer and organizes them into a tree struct
 that represents the meaning of the SQL statement.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Union
+from dataclasses import dataclass, fields, is_dataclass
+from operator import attrgetter
+from typing import Any, Callable, Hashable, List, Optional, Union
 from lexer import Token, TokenType
 
 
-# AST Node classes - each represents a different part of a SQL statement
+# Comparison operator tokens and the operators they stand for in a Condition
+COMPARISON_OPERATORS = {
+    TokenType.EQUALS: '=',
+    TokenType.GREATER: '>',
+    TokenType.LESS: '<',
+    TokenType.GREATER_EQ: '>=',
+    TokenType.LESS_EQ: '<=',
+    TokenType.NOT_EQ: '!=',
+}
 
-@dataclass
+
+# Reads a token's type; used to build shape keys (see shape_key)
+TOKEN_TYPE = attrgetter('type')
+
+# Source of the function generated for a statement shape (see compile_shape)
+SHAPE_TEMPLATE = """\
+def build(tokens):
+    return {statement}
+"""
+
+
+# AST Node classes - each represents a different part of a SQL statement.
+# They are slotted dataclasses: no per-instance __dict__, which keeps the
+# statements held by the engine's parse cache small. The parser creates them
+# with positional arguments, which bind about twice as fast as keywords
+
+@dataclass(slots=True)
 class Column:
     """Represents a column in a table definition or selection"""
     name: str
@@ -19,7 +44,7 @@ class Column:
     size: Optional[int] = None        # For VARCHAR(50), size would be 50
 
 
-@dataclass
+@dataclass(slots=True)
 class SelectStatement:
     """
     Represents a SELECT query.
@@ -30,18 +55,18 @@ class SelectStatement:
     where: Optional['WhereClause'] = None  # Optional WHERE clause for filtering
 
 
-@dataclass
+@dataclass(slots=True)
 class InsertStatement:
     """
     Represents an INSERT query.
-    Example: INSERT INTO users (name, age) VALUES ('Alice', 25)
+    Example: INSERT INTO users (name, age) VALUES ('Alice', 25), ('Bob', 30)
     """
-    table: str           # Table name to insert into
-    columns: List[str]   # Column names
-    values: List[any]    # Values to insert
+    table: str                # Table name to insert into
+    columns: List[str]        # Column names
+    values: List[List[any]]   # Values to insert, one list per row
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateTableStatement:
     """
     Represents a CREATE TABLE statement.
@@ -51,7 +76,7 @@ class CreateTableStatement:
     columns: List[Column]  # Column definitions
 
 
-@dataclass
+@dataclass(slots=True)
 class WhereClause:
     """
     Represents a WHERE clause with conditions.
@@ -60,7 +85,7 @@ class WhereClause:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Condition(WhereClause):
     """
     A single comparison condition.
@@ -71,7 +96,7 @@ class Condition(WhereClause):
     value: any       # Value to compare against
 
 
-@dataclass
+@dataclass(slots=True)
 class CompoundCondition(WhereClause):
     """
     Multiple conditions joined by AND/OR.
@@ -82,6 +107,10 @@ class CompoundCondition(WhereClause):
     right: WhereClause   # Right condition
 
 
+# Any statement node the parser can return
+Statement = Union[SelectStatement, InsertStatement, CreateTableStatement]
+
+
 class Parser:
     """
     Parses tokens into an Abstract Syntax Tree (AST).
@@ -89,8 +118,14 @@ class Parser:
     The parser implements a recursive descent parser, which means it processes
     tokens from left to right and builds the tree structure by calling methods
     that correspond to grammar rules.
+    
+    A parser only ever has these three attributes, so they are declared in
+    __slots__: instances have no __dict__ and each attribute read in the
+    parse loop is a direct slot access.
     """
     
+    __slots__ = ('tokens', 'position', 'current_token')
+    
     def __init__(self, tokens: List[Token]):
         """
         Initialize the parser with a list of tokens.
@@ -110,6 +145,14 @@ class Parser:
         else:
             self.current_token = None
     
+    def seek(self, position: int):
+        """Move to the token at the given position"""
+        self.position = position
+        if position < len(self.tokens):
+            self.current_token = self.tokens[position]
+        else:
+            self.current_token = None
+    
     def expect(self, token_type: TokenType) -> Token:
         """
         Verify that the current token is of the expected type, then consume it.
@@ -123,7 +166,7 @@ class Parser:
         Raises:
             ValueError: If the current token doesn't match the expected type
         """
-        if self.current_token.type != token_type:
+        if self.current_token.type is not token_type:
             raise ValueError(
                 f"Expected {token_type}, got {self.current_token.type} "
                 f"at position {self.current_token.position}"
@@ -142,14 +185,10 @@ class Parser:
         Returns:
             An AST node representing the SQL statement
         """
-        if self.current_token.type == TokenType.SELECT:
-            return self.parse_select()
-        elif self.current_token.type == TokenType.INSERT:
-            return self.parse_insert()
-        elif self.current_token.type == TokenType.CREATE:
-            return self.parse_create_table()
-        else:
+        parse_statement = self.STATEMENT_PARSERS.get(self.current_token.type)
+        if parse_statement is None:
             raise ValueError(f"Unexpected statement starting with {self.current_token.type}")
+        return parse_statement(self)
     
     def parse_select(self) -> SelectStatement:
         """
@@ -160,15 +199,12 @@ class Parser:
         
         # Parse column list
         columns = []
-        if self.current_token.type == TokenType.STAR:
+        if self.current_token.type is TokenType.STAR:
             columns.append('*')
             self.advance()
         else:
             # Read comma-separated column names
-            columns.append(self.expect(TokenType.IDENTIFIER).value)
-            while self.current_token.type == TokenType.COMMA:
-                self.advance()  # Skip comma
-                columns.append(self.expect(TokenType.IDENTIFIER).value)
+            columns = self.parse_identifier_list()
         
         # Parse FROM clause
         self.expect(TokenType.FROM)
@@ -176,16 +212,16 @@ class Parser:
         
         # Parse optional WHERE clause
         where = None
-        if self.current_token.type == TokenType.WHERE:
+        if self.current_token.type is TokenType.WHERE:
             self.advance()
             where = self.parse_where()
         
-        return SelectStatement(columns=columns, table=table, where=where)
+        return SelectStatement(columns, table, where)
     
     def parse_insert(self) -> InsertStatement:
         """
         Parse an INSERT statement.
-        Grammar: INSERT INTO table (columns) VALUES (values)
+        Grammar: INSERT INTO table (columns) VALUES (values) [, (values) ...]
         """
         self.expect(TokenType.INSERT)
         self.expect(TokenType.INTO)
@@ -195,24 +231,70 @@ class Parser:
         
         # Parse column list in parentheses
         self.expect(TokenType.LPAREN)
-        columns = []
-        columns.append(self.expect(TokenType.IDENTIFIER).value)
-        while self.current_token.type == TokenType.COMMA:
-            self.advance()
-            columns.append(self.expect(TokenType.IDENTIFIER).value)
+        columns = self.parse_identifier_list()
         self.expect(TokenType.RPAREN)
         
-        # Parse VALUES keyword and value list
+        # Parse VALUES keyword and one or more value lists
         self.expect(TokenType.VALUES)
-        self.expect(TokenType.LPAREN)
         values = []
-        values.append(self.parse_value())
-        while self.current_token.type == TokenType.COMMA:
+        values.append(self.parse_value_list())
+        while self.current_token.type is TokenType.COMMA:
             self.advance()
-            values.append(self.parse_value())
-        self.expect(TokenType.RPAREN)
+            values.append(self.parse_value_list())
+        
+        return InsertStatement(table, columns, values)
+    
+    def parse_identifier_list(self) -> List[str]:
+        """
+        Parse a comma-separated list of identifiers.
+        Example: id, name, age
         
-        return InsertStatement(table=table, columns=columns, values=values)
+        This runs once per column list, so it steps through the tokens with
+        local variables instead of calling advance()/expect() per token.
+        """
+        tokens = self.tokens
+        end = len(tokens) - 1
+        position = self.position
+        names = []
+        while True:
+            token = tokens[position] if position <= end else None
+            if token is None or token.type is not TokenType.IDENTIFIER:
+                self.seek(position)
+                self.expect(TokenType.IDENTIFIER)  # Raises the error
+            names.append(token.value)
+            if position == end or tokens[position + 1].type is not TokenType.COMMA:
+                break
+            position += 2  # Skip the identifier and the comma
+        self.seek(position + 1)
+        return names
+    
+    def parse_value_list(self) -> List[any]:
+        """
+        Parse a parenthesized list of values for one row.
+        Example: (1, 'Alice', 25)
+        
+        Like parse_identifier_list, the values are read with local variables
+        rather than through parse_value(), since INSERT statements spend most
+        of their parsing time here.
+        """
+        self.expect(TokenType.LPAREN)
+        tokens = self.tokens
+        end = len(tokens) - 1
+        position = self.position
+        values = []
+        while True:
+            token = tokens[position] if position <= end else None
+            if token is None or (token.type is not TokenType.NUMBER
+                                 and token.type is not TokenType.STRING):
+                self.seek(position)
+                self.parse_value()  # Raises the error
+            values.append(token.value)
+            if position == end or tokens[position + 1].type is not TokenType.COMMA:
+                break
+            position += 2  # Skip the value and the comma
+        self.seek(position + 1)
+        self.expect(TokenType.RPAREN)
+        return values
     
     def parse_create_table(self) -> CreateTableStatement:
         """
@@ -229,12 +311,12 @@ class Parser:
         self.expect(TokenType.LPAREN)
         columns = []
         columns.append(self.parse_column_definition())
-        while self.current_token.type == TokenType.COMMA:
+        while self.current_token.type is TokenType.COMMA:
             self.advance()
             columns.append(self.parse_column_definition())
         self.expect(TokenType.RPAREN)
         
-        return CreateTableStatement(table=table, columns=columns)
+        return CreateTableStatement(table, columns)
     
     def parse_column_definition(self) -> Column:
         """
@@ -246,22 +328,22 @@ class Parser:
         column_name = self.expect(TokenType.IDENTIFIER).value
         
         # Get data type
-        if self.current_token.type == TokenType.INT:
+        if self.current_token.type is TokenType.INT:
             data_type = 'INT'
             self.advance()
-            return Column(name=column_name, data_type=data_type)
-        elif self.current_token.type == TokenType.VARCHAR:
+            return Column(column_name, data_type)
+        elif self.current_token.type is TokenType.VARCHAR:
             data_type = 'VARCHAR'
             self.advance()
             
             # Check for size specification VARCHAR(50)
             size = None
-            if self.current_token.type == TokenType.LPAREN:
+            if self.current_token.type is TokenType.LPAREN:
                 self.advance()
                 size = self.expect(TokenType.NUMBER).value
                 self.expect(TokenType.RPAREN)
             
-            return Column(name=column_name, data_type=data_type, size=size)
+            return Column(column_name, data_type, size)
         else:
             raise ValueError(f"Expected data type, got {self.current_token.type}")
     
@@ -278,7 +360,7 @@ class Parser:
             operator = self.current_token.value
             self.advance()
             right = self.parse_condition()
-            left = CompoundCondition(left=left, operator=operator, right=right)
+            left = CompoundCondition(left, operator, right)
         
         return left
     
@@ -290,37 +372,108 @@ class Parser:
         column = self.expect(TokenType.IDENTIFIER).value
         
         # Get comparison operator
-        operator_map = {
-            TokenType.EQUALS: '=',
-            TokenType.GREATER: '>',
-            TokenType.LESS: '<',
-            TokenType.GREATER_EQ: '>=',
-            TokenType.LESS_EQ: '<=',
-            TokenType.NOT_EQ: '!=',
-        }
-        
-        if self.current_token.type not in operator_map:
+        operator = COMPARISON_OPERATORS.get(self.current_token.type)
+        if operator is None:
             raise ValueError(f"Expected comparison operator, got {self.current_token.type}")
-        
-        operator = operator_map[self.current_token.type]
         self.advance()
         
         # Get the value to compare against
         value = self.parse_value()
         
-        return Condition(column=column, operator=operator, value=value)
+        return Condition(column, operator, value)
     
     def parse_value(self) -> any:
         """
         Parse a literal value (number or string).
         """
-        if self.current_token.type == TokenType.NUMBER:
-            value = self.current_token.value
-            self.advance()
-            return value
-        elif self.current_token.type == TokenType.STRING:
-            value = self.current_token.value
+        token = self.current_token
+        if token.type is TokenType.NUMBER or token.type is TokenType.STRING:
             self.advance()
-            return value
+            return token.value
         else:
-            raise ValueError(f"Expected value, got {self.current_token.type}")
+            raise ValueError(f"Expected value, got {token.type}")
+    
+    # Statement parsing methods by the token a statement starts with
+    STATEMENT_PARSERS = {
+        TokenType.SELECT: parse_select,
+        TokenType.INSERT: parse_insert,
+        TokenType.CREATE: parse_create_table,
+    }
+
+
+class ValueSlot:
+    """Placeholder for the value of the token at `index` (see compile_shape)"""
+    
+    __slots__ = ('index',)
+    
+    def __init__(self, index: int):
+        self.index = index
+
+
+def shape_key(tokens: List[Token]) -> Hashable:
+    """
+    Build a hashable signature of a statement's shape: its token types.
+    
+    The parser chooses what to do next from token types alone; token values
+    (names, literals) are only copied into the AST. Statements with the same
+    token types therefore parse the same way and share a compiled builder.
+    """
+    return tuple(map(TOKEN_TYPE, tokens))
+
+
+def compile_shape(tokens: List[Token]) -> Callable[[List[Token]], Statement]:
+    """
+    Compile a builder for statements with the same shape as `tokens`.
+    
+    The tokens are parsed once with every value replaced by a ValueSlot
+    placeholder. Since the parser only branches on token types, this takes
+    the same path through the grammar as the real statement. The resulting
+    AST is then turned into Python source that rebuilds it directly,
+    reading each name and literal from its token. For example,
+    INSERT INTO users (id, name) VALUES (1, 'Alice') becomes:
+    
+        def build(tokens):
+            return InsertStatement(tokens[2].value,
+                                   [tokens[4].value, tokens[6].value],
+                                   [[tokens[10].value, tokens[12].value]])
+    
+    Calling the builder with the tokens of any statement of this shape
+    returns the same AST as parsing them, with no token checks or branching.
+    
+    Args:
+        tokens: Tokens of a statement that parses successfully
+        
+    Returns:
+        A function taking the tokens of a statement of the same shape and
+        returning its AST
+    """
+    slotted = [
+        Token(token.type, ValueSlot(index), token.position)
+        for index, token in enumerate(tokens)
+    ]
+    statement = Parser(slotted).parse()
+    source = SHAPE_TEMPLATE.format(statement=node_source(statement))
+    
+    namespace = {
+        cls.__name__: cls
+        for cls in (Column, SelectStatement, InsertStatement, CreateTableStatement,
+                    Condition, CompoundCondition)
+    }
+    exec(compile(source, '<shape>', 'exec'), namespace)
+    return namespace['build']
+
+
+def node_source(node: Any) -> str:
+    """Generate a Python expression that rebuilds an AST node (see compile_shape)"""
+    if isinstance(node, ValueSlot):
+        return f"tokens[{node.index}].value"
+    if isinstance(node, list):
+        return '[' + ', '.join(map(node_source, node)) + ']'
+    if is_dataclass(node):
+        # Positional arguments, in field order
+        arguments = ', '.join(
+            node_source(getattr(node, field.name))
+            for field in fields(node)
+        )
+        return f"{type(node).__name__}({arguments})"
+    return repr(node)
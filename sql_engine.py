@@ -4,12 +4,28 @@ This module provides the high-level API that users interact with.
 It coordinates the lexer, parser, storage, and executor.
 """
 
-from lexer import Lexer
-from parser import Parser
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+from lexer import Lexer, Token
+from parser import Parser, InsertStatement, Statement, shape_key, compile_shape
 from storage import StorageEngine
 from executor import Executor, QueryResult
 
 
+# Maximum number of parsed statements kept by each engine. Can be overridden
+# with the SQL_ENGINE_PARSE_CACHE environment variable; 0 turns the cache off
+# (e.g. for workloads where statements never repeat verbatim)
+PARSE_CACHE_SIZE = int(os.environ.get('SQL_ENGINE_PARSE_CACHE', 1024))
+
+# Maximum number of statement shapes (and their compiled builders) kept by
+# each engine
+SHAPE_CACHE_SIZE = 256
+
+# Builds the AST of a statement of one shape from its tokens
+Builder = Callable[[List[Token]], Statement]
+
+
 class SQLEngine:
     """
     The main SQL engine that processes SQL queries.
@@ -31,6 +47,11 @@ class SQLEngine:
         """
         self.storage = StorageEngine(db_path)
         self.executor = Executor(self.storage)
+        # Parsed statements keyed by their SQL text, least recently used first
+        self.parse_cache: 'OrderedDict[str, Statement]' = OrderedDict()
+        # Builders compiled for statement shapes, keyed by shape_key(); None
+        # for a shape seen only once so far. Least recently used first
+        self.shape_cache: 'OrderedDict[Hashable, Optional[Builder]]' = OrderedDict()
     
     def execute(self, sql: str) -> QueryResult:
         """
@@ -48,13 +69,8 @@ class SQLEngine:
             QueryResult containing the result of the query
         """
         try:
-            # Step 1: Tokenize the SQL statement
-            lexer = Lexer(sql)
-            tokens = lexer.tokenize()
-            
-            # Step 2: Parse tokens into an AST
-            parser = Parser(tokens)
-            ast = parser.parse()
+            # Steps 1 and 2: Tokenize and parse the SQL statement
+            ast = self.get_ast(sql)
             
             # Step 3: Execute the AST
             result = self.executor.execute(ast)
@@ -65,6 +81,142 @@ class SQLEngine:
             # Return error information in a QueryResult
             return QueryResult(message=f"Error: {str(e)}")
     
+    def get_ast(self, sql: str) -> Statement:
+        """
+        Get the AST for a SQL statement, parsing it on a cache miss.
+        
+        Repeated statements with the same text skip tokenizing and parsing.
+        The cached AST is shared between executions, which is safe because
+        the executor never modifies the statements it runs and copies any of
+        their lists it hands out (such as a result's column names). Statements that
+        fail to parse are not cached. With PARSE_CACHE_SIZE set to 0 every
+        statement is parsed.
+        
+        Args:
+            sql: The SQL statement to parse
+            
+        Returns:
+            The AST node representing the statement
+        """
+        if PARSE_CACHE_SIZE <= 0:
+            return self.parse(sql)
+        
+        ast = self.parse_cache.get(sql)
+        if ast is None:
+            ast = self.parse(sql)
+            self.parse_cache[sql] = ast
+            if len(self.parse_cache) > PARSE_CACHE_SIZE:
+                self.parse_cache.popitem(last=False)
+        else:
+            self.parse_cache.move_to_end(sql)
+        return ast
+    
+    def parse(self, sql: str) -> Statement:
+        """
+        Turn a SQL statement into an AST.
+        
+        Statements that differ only in their names and literals have the same
+        shape (the same sequence of token types). The first time a shape is
+        seen, the statement is parsed normally. The second time, a builder is
+        compiled for the shape (see parser.compile_shape), and from then on
+        statements of that shape are built by it without running the parser.
+        
+        Args:
+            sql: The SQL statement to parse
+            
+        Returns:
+            The AST node representing the statement
+        """
+        # Step 1: Tokenize the SQL statement
+        lexer = Lexer(sql)
+        tokens = lexer.tokenize()
+        
+        # Step 2: Parse tokens into an AST, with the shape's builder if it
+        # has been seen before
+        key = shape_key(tokens)
+        if key in self.shape_cache:
+            self.shape_cache.move_to_end(key)
+            build = self.shape_cache[key]
+            if build is None:
+                build = self.shape_cache[key] = compile_shape(tokens)
+            return build(tokens)
+        
+        parser = Parser(tokens)
+        statement = parser.parse()
+        self.shape_cache[key] = None
+        if len(self.shape_cache) > SHAPE_CACHE_SIZE:
+            self.shape_cache.popitem(last=False)
+        return statement
+    
+    def execute_many(self, sql_list: List[str]) -> List[QueryResult]:
+        """
+        Execute several SQL statements in order.
+        
+        Consecutive INSERT statements into the same table and columns are run
+        as one batch, so the table is validated and saved once for the whole
+        run instead of once per statement. If a batch fails, its statements
+        are executed one at a time so each one reports its own result. A
+        failed batch leaves the table as it was, whether a row was invalid or
+        writing to disk failed, so no row is inserted twice.
+        
+        Args:
+            sql_list: The SQL statements to execute
+            
+        Returns:
+            One QueryResult per statement, in the same order
+        """
+        results = [None] * len(sql_list)
+        batch = []  # (index, InsertStatement) pairs waiting to be inserted
+        
+        def flush_batch():
+            statements = [statement for _, statement in batch]
+            if len(statements) > 1:
+                try:
+                    batch_results = self.executor.execute_insert_many(statements)
+                except Exception:
+                    # Nothing was inserted (a failed batch is rolled back in
+                    # storage); run them one by one to report each result
+                    batch_results = [self.execute_statement(s) for s in statements]
+            else:
+                batch_results = [self.execute_statement(s) for s in statements]
+            
+            for (index, _), result in zip(batch, batch_results):
+                results[index] = result
+            batch.clear()
+        
+        for index, sql in enumerate(sql_list):
+            try:
+                ast = self.get_ast(sql)
+            except Exception as e:
+                results[index] = QueryResult(message=f"Error: {str(e)}")
+                continue
+            
+            if isinstance(ast, InsertStatement):
+                if batch and (batch[0][1].table, batch[0][1].columns) != (ast.table, ast.columns):
+                    flush_batch()
+                batch.append((index, ast))
+            else:
+                flush_batch()
+                results[index] = self.execute_statement(ast)
+        
+        flush_batch()
+        return results
+    
+    def execute_statement(self, statement) -> QueryResult:
+        """
+        Execute an already parsed statement.
+        
+        Args:
+            statement: The AST node to execute
+            
+        Returns:
+            QueryResult containing the result, or the error message
+        """
+        try:
+            return self.executor.execute(statement)
+        except Exception as e:
+            return QueryResult(message=f"Error: {str(e)}")
+    
     def list_tables(self) -> list:
         """
         Get a list of all tables in the database.
@@ -74,6 +226,39 @@ class SQLEngine:
         """
         return self.storage.list_tables()
     
+    def insert_columns(self, table_name: str, column_values: Dict[str, Sequence[Any]]) -> int:
+        """
+        Bulk-load rows into a table, given column by column.
+        
+        Much faster than INSERT statements for large amounts of data: there
+        is no SQL to parse and each column is validated in one pass.
+        
+        Example:
+            engine.insert_columns('users', {'id': [1, 2], 'name': ['Alice', 'Bob']})
+        
+        Args:
+            table_name: Name of the table
+            column_values: One sequence of values per column, all the same
+                length
+                
+        Returns:
+            Number of rows inserted
+        """
+        return self.storage.insert_columns(table_name, column_values)
+    
+    def create_index(self, table_name: str, column: str):
+        """
+        Create a hash index on a table column.
+        
+        SELECTs whose WHERE clause requires the column to equal a value then
+        only look at the rows holding that value instead of scanning the table.
+        
+        Args:
+            table_name: Name of the table
+            column: Name of the column to index
+        """
+        self.storage.create_index(table_name, column)
+    
     def describe_table(self, table_name: str) -> str:
         """
         Get information about a table's structure.
@@ -95,7 +280,10 @@ class SQLEngine:
                 col_info += f"({col.size})"
             result.append(col_info)
         
-        result.append(f"\nTotal rows: {len(table.rows)}")
+        if table.indexes:
+            result.append(f"Indexes: {', '.join(table.indexes)}")
+        
+        result.append(f"\nTotal rows: {table.row_count}")
         return '\n'.join(result)
 
 
@@ -132,6 +320,7 @@ def main():
             
             # Handle special commands
             if sql == '.quit':
+                engine.storage.flush()
                 print("Goodbye!")
                 break
             elif sql == '.tables':
@@ -156,6 +345,7 @@ def main():
         except KeyboardInterrupt:
             print("\nUse .quit to exit")
         except EOFError:
+            engine.storage.flush()
             print("\nGoodbye!")
             break
         except Exception as e:
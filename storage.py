@@ -5,10 +5,120 @@ For simplicity, we use JSON files to store tables.
 """
 
 import json
+import mmap
 import os
-from typing import Dict, List, Any, Optional
+from array import array
+from typing import Callable, Dict, List, Any, Iterable, Iterator, MutableSequence, Optional, Sequence, Tuple
 from parser import Column
 
+# orjson is an optional, much faster JSON encoder/decoder written in C. The
+# files it writes are the same JSON, so either library can read them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# array typecode for INT columns: signed 64-bit, 8 bytes per value
+INT_TYPECODE = 'q'
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+
+# A table's insert log is folded into its snapshot once it holds at least this
+# many rows and at least as many rows as the snapshot (see StorageEngine)
+LOG_COMPACT_ROWS = 1000
+
+# Key of the first line of an insert log, which holds the generation of the
+# snapshot the log extends. '#' cannot appear in a column name, so the line
+# cannot be mistaken for a row
+LOG_GENERATION_KEY = '#generation'
+
+
+def column_check(col: Column) -> Callable[[Sequence[Any]], bool]:
+    """
+    Build a fast check for a batch of values going into a column.
+    
+    The check tests the whole batch with built-ins that run in C (the set of
+    value types, min/max, the longest string) rather than one value at a
+    time. It only answers whether every value is valid in the common way:
+    exactly int or str, within range or size. When it says no,
+    Table.validate_value is used to find and report the offending value.
+    
+    Args:
+        col: The column definition
+        
+    Returns:
+        A function taking a non-empty sequence of values and returning True
+        if all of them are valid for the column
+    """
+    if col.data_type == 'INT':
+        def check(values: Sequence[Any]) -> bool:
+            return (set(map(type, values)) == {int}
+                    and INT_MIN <= min(values) and max(values) <= INT_MAX)
+    elif col.data_type == 'VARCHAR':
+        size = col.size
+        def check(values: Sequence[Any]) -> bool:
+            return (set(map(type, values)) == {str}
+                    and (not size or max(map(len, values)) <= size)
+                    and is_encodable(''.join(values)))
+    else:
+        def check(values: Sequence[Any]) -> bool:
+            return True
+    return check
+
+
+def is_encodable(text: str) -> bool:
+    """
+    Check that a string can be encoded as UTF-8, and so written to disk.
+    
+    Python strings can hold unpaired surrogates (e.g. '\\ud800'), which are not
+    valid Unicode text: orjson refuses to serialize them, and the stdlib json
+    module writes escapes that orjson then refuses to read back.
+    """
+    if text.isascii():
+        return True
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact JSON, encoded as UTF-8"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson cannot write integers outside the 64-bit range, which
+            # tables loaded from older files may hold (see Table.unpack)
+            pass
+    return json.dumps(data).encode('utf-8')
+
+
+def loads_json(data: bytes, exact: bool = False) -> Any:
+    """Parse JSON from UTF-8 encoded bytes (see read_json for `exact`)"""
+    if orjson is not None and not exact:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: str, exact: bool = False) -> Any:
+    """
+    Parse a JSON file.
+    
+    With orjson the file is memory-mapped and parsed in place, so it is never
+    copied into a bytes object first; the pages are read in as the parser
+    reaches them. orjson reads integers outside the 64-bit range as floats;
+    pass `exact` to parse with the stdlib json module, which keeps them.
+    """
+    with open(path, 'rb') as f:
+        if exact or orjson is None or not os.fstat(f.fileno()).st_size:
+            return loads_json(f.read(), exact)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
 
 class Table:
     """
@@ -17,7 +127,18 @@ class Table:
     Each table has:
     - A name
     - A schema (column definitions)
-    - Rows of data
+    - Column data, stored column by column (one contiguous buffer per column)
+    
+    Storing each column on its own means a query only touches the columns it
+    actually references. INT columns are packed 64-bit arrays; VARCHAR columns
+    (and INT columns with missing values or, from older files, values outside
+    the 64-bit range) are plain Python lists.
+    
+    Each VARCHAR column keeps a pool of the distinct strings stored in it, and
+    every value is replaced by its pooled copy as it is added. A column with
+    few distinct values (a department, a city) then holds one string object
+    per distinct value and a list of references to them, rather than a
+    separate string per row.
     """
     
     def __init__(self, name: str, columns: List[Column]):
@@ -30,68 +151,408 @@ class Table:
         """
         self.name = name
         self.columns = columns
-        self.rows: List[Dict[str, Any]] = []
+        self.column_data: Dict[str, MutableSequence] = {
+            col.name: array(INT_TYPECODE) if col.data_type == 'INT' else []
+            for col in columns
+        }
+        self.column_index = {col.name: i for i, col in enumerate(columns)}
+        # Hash indexes: column name -> value -> ids of the rows holding it,
+        # packed like INT columns
+        self.indexes: Dict[str, Dict[Any, array]] = {}
+        # Batch validity check of each column, built once for the schema
+        self.column_checks = {col.name: column_check(col) for col in columns}
+        # Distinct strings of each VARCHAR column, each mapped to itself
+        self.string_pools: Dict[str, Dict[str, str]] = {
+            col.name: {} for col in columns if col.data_type == 'VARCHAR'
+        }
+        self.row_count = 0
+        # Columns that have at least one row where no value was supplied
+        self.missing_columns = set()
     
     def get_column_names(self) -> List[str]:
         """Get a list of all column names in this table"""
         return [col.name for col in self.columns]
     
-    def validate_row(self, row: Dict[str, Any]) -> bool:
+    def validate_value(self, col: Column, value: Any):
+        """
+        Validate a single value against its column definition.
+        
+        Args:
+            col: The column the value is stored in
+            value: The value to check
+            
+        Raises:
+            ValueError: If the value has the wrong type or size
+        """
+        if col.data_type == 'INT':
+            if not isinstance(value, int):
+                raise ValueError(
+                    f"Column '{col.name}' expects INT, got {type(value).__name__}"
+                )
+            if not INT_MIN <= value <= INT_MAX:
+                raise ValueError(
+                    f"Value for '{col.name}' is out of range for INT"
+                )
+        elif col.data_type == 'VARCHAR':
+            if not isinstance(value, str):
+                raise ValueError(
+                    f"Column '{col.name}' expects VARCHAR, got {type(value).__name__}"
+                )
+            if col.size and len(value) > col.size:
+                raise ValueError(
+                    f"Value for '{col.name}' exceeds maximum length of {col.size}"
+                )
+            if not is_encodable(value):
+                raise ValueError(
+                    f"Value for '{col.name}' is not valid Unicode text"
+                )
+    
+    def resolve_columns(self, names: List[str]) -> List[Column]:
         """
-        Validate that a row conforms to the table schema.
+        Look up the column definitions for a list of column names.
         
-        Checks:
-        - All columns in the row exist in the schema
-        - Data types match (basic type checking)
+        Args:
+            names: Column names, e.g. the column list of an INSERT
+            
+        Returns:
+            The matching column definitions, in the same order
+        """
+        # One set comparison against the column index checks every name; the
+        # offending name is only looked for on failure
+        unique = set(names)
+        if not unique <= self.column_index.keys():
+            name = next(name for name in names if name not in self.column_index)
+            raise ValueError(f"Column '{name}' does not exist in table '{self.name}'")
+        if len(unique) != len(names):
+            duplicate = next(name for name in names if names.count(name) > 1)
+            raise ValueError(f"Column '{duplicate}' is specified more than once")
+        return [self.columns[self.column_index[name]] for name in names]
+    
+    def insert(self, row: Dict[str, Any]):
+        """
+        Insert a new row into the table.
         
         Args:
             row: Dictionary mapping column names to values
+        """
+        self.insert_values(list(row.keys()), [list(row.values())])
+    
+    def insert_values(self, names: List[str], value_rows: List[List[Any]]):
+        """
+        Insert rows given as positional value lists.
+        
+        Column positions are resolved once for the whole batch rather than
+        once per row, and no per-row dictionaries are built. Every row is
+        validated before any of them is added, so either all rows are
+        inserted or none are. The values are then appended one column at a
+        time.
+        
+        Validation is done a column at a time as well, with the checks from
+        column_check. Only if one of them fails are the values checked one
+        by one, to report the first invalid value in row order.
+        
+        Args:
+            names: Names of the columns the values are for
+            value_rows: One list of values per row, in the order of `names`
+        """
+        columns = self.resolve_columns(names)
+        count = len(value_rows)
+        if not count:
+            return
+        
+        # Transpose the rows into one sequence of values per column
+        values_by_column = dict(zip(names, zip(*value_rows)))
+        
+        if set(map(len, value_rows)) != {len(columns)} or not all(
+            self.column_checks[name](values) for name, values in values_by_column.items()
+        ):
+            for values in value_rows:
+                if len(values) != len(columns):
+                    raise ValueError(
+                        f"Expected {len(columns)} values, got {len(values)}"
+                    )
+                for col, value in zip(columns, values):
+                    self.validate_value(col, value)
+        
+        self.extend_columns(values_by_column, count)
+    
+    def insert_columns(self, column_values: Dict[str, Sequence[Any]]) -> int:
+        """
+        Insert rows given column by column.
+        
+        This is the bulk load path: the values for each column arrive as one
+        sequence (a list, tuple or array), so they are validated with one
+        column_check call per column and appended without ever being split
+        into rows. Columns left out get no value. As with insert_values,
+        either all rows are inserted or none are.
+        
+        Args:
+            column_values: One sequence of values per column, all the same
+                length
+                
+        Returns:
+            Number of rows inserted
+        """
+        columns = self.resolve_columns(list(column_values))
+        lengths = set(map(len, column_values.values()))
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        count = lengths.pop() if lengths else 0
+        if not count:
+            return 0
+        
+        if not all(
+            self.column_checks[name](values) for name, values in column_values.items()
+        ):
+            for col, values in zip(columns, column_values.values()):
+                for value in values:
+                    self.validate_value(col, value)
+        
+        self.extend_columns(column_values, count)
+        return count
+    
+    def extend_columns(self, values_by_column: Dict[str, Sequence[Any]], count: int):
+        """
+        Append `count` validated rows given column by column.
+        
+        Columns missing from `values_by_column` get a None placeholder.
+        
+        Args:
+            values_by_column: One sequence of `count` values per column
+            count: Number of rows to append
+        """
+        for name, data in self.column_data.items():
+            if name in values_by_column:
+                data.extend(self.pooled(name, values_by_column[name]))
+            else:
+                self.mark_missing(name).extend([None] * count)
+        self.row_count += count
+        self.index_rows(self.row_count - count)
+    
+    def append_row(self, row: Dict[str, Any]):
+        """
+        Append a row to the column buffers without validating it.
+        
+        Columns missing from the row get a None placeholder.
+        
+        Args:
+            row: Dictionary mapping column names to values
+        """
+        for name, data in self.column_data.items():
+            value = row.get(name)
+            if value is None:
+                data = self.mark_missing(name)
+            elif name in self.string_pools:
+                value = self.string_pools[name].setdefault(value, value)
+            try:
+                data.append(value)
+            except (OverflowError, TypeError):
+                # Outside the 64-bit range (see unpack)
+                self.unpack(name).append(value)
+        self.row_count += 1
+        self.index_rows(self.row_count - 1)
+    
+    def append_columns(self, column_values: Dict[str, List[Any]]):
+        """
+        Append rows given column by column, without validating them.
+        
+        Args:
+            column_values: One list of values per column, for every column of
+                the table, all the same length. None marks a missing value
+        """
+        for name, data in self.column_data.items():
+            values = column_values[name]
+            if None in values:
+                data = self.mark_missing(name)
+            elif isinstance(data, array):
+                # Packed into a new array first, so a value outside the
+                # 64-bit range (see unpack) is found before anything is added
+                try:
+                    values = array(INT_TYPECODE, values)
+                except (OverflowError, TypeError):
+                    data = self.unpack(name)
+            data.extend(self.pooled(name, values))
+        if self.columns:
+            start = self.row_count
+            self.row_count += len(column_values[self.columns[0].name])
+            self.index_rows(start)
+    
+    def create_index(self, name: str):
+        """
+        Build a hash index on a column.
+        
+        The index maps each value in the column to the ids of the rows that
+        hold it, so finding the rows equal to a value (see probe) is a
+        dictionary lookup instead of a scan. It is kept up to date as rows
+        are added. Missing values are not indexed. Row ids are kept in packed
+        arrays, at 8 bytes each instead of a list slot plus an int object.
+        
+        Args:
+            name: Name of the column to index
+        """
+        if name not in self.column_index:
+            raise ValueError(f"Column '{name}' does not exist in table '{self.name}'")
+        if name in self.indexes:
+            return
+        self.indexes[name] = {}
+        self.index_rows(0, [name])
+    
+    def index_rows(self, start: int, names: Optional[List[str]] = None):
+        """
+        Add rows from `start` to the end of the table to the hash indexes.
+        
+        Args:
+            start: Id of the first row to add
+            names: Indexed columns to update (default: all of them)
+        """
+        for name in names or self.indexes:
+            index = self.indexes[name]
+            data = self.column_data[name]
+            for row_id in range(start, self.row_count):
+                value = data[row_id]
+                if value is not None:
+                    rows = index.get(value)
+                    if rows is None:
+                        rows = index[value] = array(INT_TYPECODE)
+                    rows.append(row_id)
+    
+    def probe(self, name: str, value: Any) -> Sequence[int]:
+        """
+        Find the rows whose value in an indexed column equals `value`.
+        
+        Args:
+            name: Name of a column with an index (see create_index)
+            value: The value to look up
             
         Returns:
-            True if valid, raises ValueError if invalid
+            Ids of the matching rows, in ascending order
         """
-        column_names = self.get_column_names()
+        return self.indexes[name].get(value, ())
+    
+    def pooled(self, name: str, values: Sequence[Any]) -> Iterable[Any]:
+        """
+        Replace the strings among values with their pooled copies.
         
-        # Check that all keys in the row exist as columns
-        for key in row.keys():
-            if key not in column_names:
-                raise ValueError(f"Column '{key}' does not exist in table '{self.name}'")
+        Args:
+            name: Column the values are added to
+            values: The values to add
+            
+        Returns:
+            The values to store; unchanged for columns other than VARCHAR
+        """
+        pool = self.string_pools.get(name)
+        if pool is None:
+            return values
+        return map(pool.setdefault, values, values)
+    
+    def mark_missing(self, name: str) -> MutableSequence:
+        """
+        Record that a column has a row without a value, returning its buffer.
+        
+        A packed INT column cannot hold None, so it is converted to a list the
+        first time this happens.
         
-        # Basic type validation
+        Args:
+            name: Column name
+        """
+        data = self.unpack(name)
+        self.missing_columns.add(name)
+        return data
+    
+    def unpack(self, name: str) -> MutableSequence:
+        """
+        Convert a packed INT column to a list, returning its buffer.
+        
+        Needed for values a 64-bit array cannot hold: None (see mark_missing)
+        and integers outside the 64-bit range. INSERT rejects the latter, but
+        files written before INT columns were packed may contain them, and
+        they are loaded as they are.
+        
+        Args:
+            name: Column name
+        """
+        data = self.column_data[name]
+        if isinstance(data, array):
+            data = self.column_data[name] = list(data)
+        return data
+    
+    def has_float_ints(self) -> bool:
+        """
+        Check whether an INT column holds floats.
+        
+        Only unpacked columns are looked at; a packed array cannot hold one.
+        """
         for col in self.columns:
-            if col.name in row:
-                value = row[col.name]
-                if col.data_type == 'INT':
-                    if not isinstance(value, int):
-                        raise ValueError(
-                            f"Column '{col.name}' expects INT, got {type(value).__name__}"
-                        )
-                elif col.data_type == 'VARCHAR':
-                    if not isinstance(value, str):
-                        raise ValueError(
-                            f"Column '{col.name}' expects VARCHAR, got {type(value).__name__}"
-                        )
-                    if col.size and len(value) > col.size:
-                        raise ValueError(
-                            f"Value for '{col.name}' exceeds maximum length of {col.size}"
-                        )
+            data = self.column_data[col.name]
+            if col.data_type == 'INT' and not isinstance(data, array) and float in set(map(type, data)):
+                return True
+        return False
+    
+    def truncate(self, row_count: int):
+        """
+        Remove every row from `row_count` on, undoing the last appends.
         
-        return True
+        Used to take back rows that were added in memory but could not be
+        written to disk. Indexes and missing-value tracking are rolled back
+        with the rows.
+        
+        Args:
+            row_count: Number of rows to keep
+        """
+        if row_count >= self.row_count:
+            return
+        
+        # Row ids are added to each index entry in ascending order, so the
+        # removed rows are the last ids of their entries
+        for name, index in self.indexes.items():
+            data = self.column_data[name]
+            for row_id in range(row_count, self.row_count):
+                value = data[row_id]
+                if value is not None:
+                    rows = index[value]
+                    rows.pop()
+                    if not rows:
+                        del index[value]
+        
+        for data in self.column_data.values():
+            del data[row_count:]
+        for name in list(self.missing_columns):
+            data = self.column_data[name]
+            if None not in data:
+                self.missing_columns.discard(name)
+                if self.columns[self.column_index[name]].data_type == 'INT':
+                    try:
+                        self.column_data[name] = array(INT_TYPECODE, data)
+                    except (OverflowError, TypeError):
+                        pass  # Stays a list; see unpack
+        self.row_count = row_count
     
-    def insert(self, row: Dict[str, Any]):
+    def iter_rows(self, start: int = 0) -> Iterator[Dict[str, Any]]:
         """
-        Insert a new row into the table.
+        Rebuild row dictionaries from the column buffers.
+        
+        Only used for the insert log; queries work on the columns directly.
+        Missing values are left out of the row, as they were on insert.
         
         Args:
-            row: Dictionary mapping column names to values
+            start: Index of the first row to rebuild
         """
-        self.validate_row(row)
-        self.rows.append(row)
+        names = self.get_column_names()
+        for values in zip(*(self.column_data[name][start:] for name in names)):
+            yield {
+                name: value
+                for name, value in zip(names, values)
+                if value is not None
+            }
     
     def to_dict(self) -> Dict:
         """
         Serialize table to a dictionary for JSON storage.
         
+        The data is stored column by column, as it is held in memory, so
+        saving and loading never build a dictionary per row. Missing values
+        are stored as null.
+        
         Returns:
             Dictionary representation of the table
         """
@@ -105,7 +566,11 @@ class Table:
                 }
                 for col in self.columns
             ],
-            'rows': self.rows
+            'column_data': {
+                name: data.tolist() if isinstance(data, array) else data
+                for name, data in self.column_data.items()
+            },
+            'indexes': list(self.indexes)
         }
     
     @classmethod
@@ -113,6 +578,9 @@ class Table:
         """
         Deserialize table from a dictionary.
         
+        Tables saved row by row (a 'rows' list of row dictionaries, the
+        format used by earlier versions) are read as well.
+        
         Args:
             data: Dictionary representation of a table
             
@@ -129,7 +597,13 @@ class Table:
         ]
         
         table = cls(name=data['name'], columns=columns)
-        table.rows = data['rows']
+        if 'column_data' in data:
+            table.append_columns(data['column_data'])
+        else:
+            for row in data['rows']:
+                table.append_row(row)
+        for name in data.get('indexes', []):
+            table.create_index(name)
         return table
 
 
@@ -140,6 +614,23 @@ class StorageEngine:
     Each database is stored in a directory, with each table as a separate JSON file.
     This is a simple approach suitable for learning. Production databases use
     much more sophisticated storage formats for performance.
+    
+    Inserted rows are not written by rewriting the table's JSON file. They
+    are appended to an insert log next to it, `<table>.jsonl`, one JSON
+    object per line. The log is folded back into the JSON snapshot by
+    flush(), or automatically once it has grown as large as the snapshot,
+    so inserting N rows writes O(N) bytes in total.
+    
+    Each snapshot carries a generation number, raised every time the table
+    is saved, and each log starts with the generation of the snapshot it
+    extends. A log left behind by a crash between writing a snapshot and
+    removing the old log is then recognized as already folded in and is not
+    replayed a second time. A partial last line, left by a crash while
+    appending, is cut off on load.
+    
+    Tables are loaded lazily: opening the database only lists the table
+    files, and each table is read (and its log replayed) the first time it
+    is used, so startup does not depend on the size of the database.
     """
     
     def __init__(self, db_path: str = './database'):
@@ -150,42 +641,216 @@ class StorageEngine:
             db_path: Path to the directory where database files are stored
         """
         self.db_path = db_path
+        # Tables loaded into memory so far
         self.tables: Dict[str, Table] = {}
+        # Path of the JSON file of every table, loaded or not
+        self.table_files: Dict[str, str] = {}
+        # Number of rows in each table's insert log, for tables that have one
+        self.log_rows: Dict[str, int] = {}
+        # Generation of each loaded table's snapshot on disk
+        self.generations: Dict[str, int] = {}
         
         # Create database directory if it doesn't exist
         os.makedirs(db_path, exist_ok=True)
         
-        # Load existing tables from disk
+        # Find the existing tables; they are read from disk when first used
         self.load_database()
     
     def load_database(self):
         """
-        Load all tables from disk into memory.
+        Find the tables stored on disk.
         
-        Reads all .json files in the database directory and loads them as tables.
+        Records the path of every .json file in the database directory as a
+        table. No file is read here; see load_table.
         """
-        if not os.path.exists(self.db_path):
+        try:
+            entries = os.scandir(self.db_path)
+        except FileNotFoundError:
             return
         
-        for filename in os.listdir(self.db_path):
-            if filename.endswith('.json'):
-                table_name = filename[:-5]  # Remove .json extension
-                table_path = os.path.join(self.db_path, filename)
-                
-                with open(table_path, 'r') as f:
-                    table_data = json.load(f)
-                    self.tables[table_name] = Table.from_dict(table_data)
+        with entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    table_name = entry.name[:-5]  # Remove .json extension
+                    self.table_files[table_name] = entry.path
+    
+    def load_table(self, name: str) -> Table:
+        """
+        Read a table from disk into memory.
+        
+        Loads the table's JSON file, then replays its insert log, if it has
+        one and it belongs to this snapshot. The table is only registered once
+        both have been read: if either fails, nothing is kept, so the next use
+        of the table tries again and reports the error again, and no insert
+        can start a new log over the one that failed to load.
+        
+        Args:
+            name: Name of a table in table_files
+            
+        Returns:
+            The loaded table
+        """
+        table, generation, log_rows = self.read_table(name)
+        if orjson is not None and table.has_float_ints():
+            # INT values too large for orjson were read as floats; read the
+            # table again with the stdlib parser to get them back exactly
+            table, generation, log_rows = self.read_table(name, exact=True)
+        
+        self.generations[name] = generation
+        if log_rows is not None:
+            self.log_rows[name] = log_rows
+        self.tables[name] = table
+        return table
+    
+    def read_table(self, name: str, exact: bool = False) -> Tuple[Table, int, Optional[int]]:
+        """
+        Read a table's JSON file and replay its insert log, if it has one.
+        
+        Args:
+            name: Name of a table in table_files
+            exact: Parse with the stdlib json module (see read_json)
+            
+        Returns:
+            The table, the generation of its snapshot, and the number of rows
+            in its log, or None if there is no log to append to
+        """
+        table_data = read_json(self.table_files[name], exact)
+        generation = table_data.get('generation', 0)
+        table = Table.from_dict(table_data)
+        
+        log_path = self.log_path(name)
+        try:
+            with open(log_path, 'rb') as f:
+                log = f.read()
+        except FileNotFoundError:
+            return table, generation, None
+        
+        # A crash while appending can leave the last line incomplete. Its
+        # insert never completed, so the partial line is cut off; otherwise
+        # the next append would be joined to it
+        end = log.rfind(b'\n') + 1
+        if end < len(log):
+            with open(log_path, 'r+b') as f:
+                f.truncate(end)
+        rows = [loads_json(line, exact) for line in log[:end].splitlines() if line.strip()]
+        
+        if rows and LOG_GENERATION_KEY in rows[0]:
+            if rows.pop(0)[LOG_GENERATION_KEY] != generation:
+                # Written for an older snapshot, which already holds its rows
+                return table, generation, None
+        elif not rows:
+            # Nothing to replay; the next append starts a new log
+            return table, generation, None
+        
+        for row in rows:
+            table.append_row(row)
+        return table, generation, len(rows)
     
     def save_table(self, table: Table):
         """
-        Save a table to disk.
+        Save a table to disk as a full snapshot, emptying its insert log.
         
         Args:
             table: The table to save
         """
+        generation = self.generations.get(table.name, 0) + 1
+        table_data = table.to_dict()
+        table_data['generation'] = generation
+        
         table_path = os.path.join(self.db_path, f"{table.name}.json")
-        with open(table_path, 'w') as f:
-            json.dump(table.to_dict(), f, indent=2)
+        temp_path = table_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(dumps_json(table_data))
+        os.replace(temp_path, table_path)
+        self.generations[table.name] = generation
+        
+        # Remove the log if there is one, in a single call rather than a
+        # stat followed by a removal. The snapshot is already saved, so a
+        # log that cannot be removed is only stale: it is for an older
+        # generation, so it is not replayed, and the next append overwrites it
+        self.log_rows.pop(table.name, None)
+        try:
+            os.remove(self.log_path(table.name))
+        except OSError:
+            pass
+    
+    def append_log(self, table: Table, count: int):
+        """
+        Persist the last `count` rows of a table by appending them to its log.
+        
+        The log is folded into the snapshot instead once it would hold at
+        least LOG_COMPACT_ROWS rows and as many rows as the snapshot. A new
+        log starts with a line giving the generation of the snapshot.
+        
+        If the write fails partway (a full disk, say), the log is cut back to
+        its size before the write, so neither a fragment of a line nor a
+        complete line of the failed rows is left in it.
+        
+        Args:
+            table: The table the rows were inserted into
+            count: Number of rows at the end of the table to persist
+        """
+        if not count:
+            return
+        
+        log_rows = self.log_rows.get(table.name, 0) + count
+        if log_rows >= LOG_COMPACT_ROWS and log_rows * 2 >= table.row_count:
+            self.save_table(table)
+            return
+        
+        lines = [dumps_json(row) + b'\n' for row in table.iter_rows(table.row_count - count)]
+        if table.name in self.log_rows:
+            mode = 'ab'
+        else:
+            mode = 'wb'
+            header = {LOG_GENERATION_KEY: self.generations.get(table.name, 0)}
+            lines.insert(0, dumps_json(header) + b'\n')
+        path = self.log_path(table.name)
+        size = None
+        try:
+            with open(path, mode) as f:
+                size = f.tell()
+                f.write(b''.join(lines))
+        except Exception:
+            if size is not None:
+                os.truncate(path, size)
+            raise
+        self.log_rows[table.name] = log_rows
+    
+    def commit_rows(self, table: Table, start: int):
+        """
+        Persist the rows added to a table since it had `start` rows.
+        
+        If they cannot be written, they are removed from memory again before
+        the error is raised. append_log has already cut any part of them that
+        reached the log back off, so neither memory nor disk keeps the failed
+        rows and the insert can safely be retried.
+        
+        Args:
+            table: The table the rows were inserted into
+            start: Row count of the table before the insert
+        """
+        try:
+            self.append_log(table, table.row_count - start)
+        except Exception:
+            table.truncate(start)
+            raise
+    
+    def log_path(self, table_name: str) -> str:
+        """Path of a table's insert log"""
+        return os.path.join(self.db_path, f"{table_name}.jsonl")
+    
+    def flush(self):
+        """
+        Fold the insert log of every loaded table into its JSON snapshot.
+        
+        Nothing is lost without calling this, since logged rows are replayed
+        on load; it only keeps the logs from growing between compactions.
+        Tables that were never loaded have not been inserted into, so their
+        logs are left as they are.
+        """
+        for name in list(self.log_rows):
+            self.save_table(self.tables[name])
     
     def create_table(self, name: str, columns: List[Column]):
         """
@@ -195,16 +860,17 @@ class StorageEngine:
             name: Table name
             columns: List of column definitions
         """
-        if name in self.tables:
+        if name in self.table_files:
             raise ValueError(f"Table '{name}' already exists")
         
         table = Table(name, columns)
         self.tables[name] = table
+        self.table_files[name] = os.path.join(self.db_path, f"{name}.json")
         self.save_table(table)
     
     def get_table(self, name: str) -> Optional[Table]:
         """
-        Retrieve a table by name.
+        Retrieve a table by name, loading it from disk on first use.
         
         Args:
             name: Table name
@@ -212,7 +878,10 @@ class StorageEngine:
         Returns:
             Table instance or None if not found
         """
-        return self.tables.get(name)
+        table = self.tables.get(name)
+        if table is None and name in self.table_files:
+            table = self.load_table(name)
+        return table
     
     def insert_row(self, table_name: str, row: Dict[str, Any]):
         """
@@ -226,13 +895,70 @@ class StorageEngine:
         if not table:
             raise ValueError(f"Table '{table_name}' does not exist")
         
+        start = table.row_count
         table.insert(row)
+        self.commit_rows(table, start)
+    
+    def insert_rows(self, table_name: str, columns: List[str], value_rows: List[List[Any]]):
+        """
+        Insert one or more rows into a table, writing them to disk at once.
+        
+        Args:
+            table_name: Name of the table
+            columns: Names of the columns the values are for
+            value_rows: One list of values per row, in the order of `columns`
+        """
+        table = self.get_table(table_name)
+        if not table:
+            raise ValueError(f"Table '{table_name}' does not exist")
+        
+        start = table.row_count
+        table.insert_values(columns, value_rows)
+        self.commit_rows(table, start)
+    
+    def insert_columns(self, table_name: str, column_values: Dict[str, Sequence[Any]]) -> int:
+        """
+        Insert rows given column by column, writing them to disk at once.
+        
+        Args:
+            table_name: Name of the table
+            column_values: One sequence of values per column, all the same
+                length
+                
+        Returns:
+            Number of rows inserted
+        """
+        table = self.get_table(table_name)
+        if not table:
+            raise ValueError(f"Table '{table_name}' does not exist")
+        
+        start = table.row_count
+        count = table.insert_columns(column_values)
+        self.commit_rows(table, start)
+        return count
+    
+    def create_index(self, table_name: str, column: str):
+        """
+        Create a hash index on a table column and save the table.
+        
+        The index itself is not written to disk, only the fact that the column
+        is indexed; the index is rebuilt when the table is loaded.
+        
+        Args:
+            table_name: Name of the table
+            column: Name of the column to index
+        """
+        table = self.get_table(table_name)
+        if not table:
+            raise ValueError(f"Table '{table_name}' does not exist")
+        
+        table.create_index(column)
         self.save_table(table)
     
     def table_exists(self, name: str) -> bool:
         """Check if a table exists"""
-        return name in self.tables
+        return name in self.table_files
     
     def list_tables(self) -> List[str]:
         """Get a list of all table names"""
-        return list(self.tables.keys())
+        return list(self.table_files.keys())
@@ -3,9 +3,35 @@ Simple test script for the SQL Engine
 Demonstrates basic programmatic usage
 """
 
+import errno
+import os
+import tempfile
+
+import storage
 from sql_engine import SQLEngine
 
 
+class FullDiskFile:
+    """Wrap a file so a write stores only part of its data, then fails"""
+    
+    def __init__(self, f, cut):
+        self.f = f
+        self.cut = cut  # Returns how many bytes of the data are written
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.f.close()
+    
+    def tell(self):
+        return self.f.tell()
+    
+    def write(self, data):
+        self.f.write(data[:self.cut(data)])
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+
 def test_basic_operations():
     """Test basic SQL operations"""
     
@@ -103,9 +129,245 @@ def test_data_validation():
     print()
 
 
+def test_batched_inserts():
+    """Test multi-row INSERT and batching in execute_many"""
+    
+    with tempfile.TemporaryDirectory() as db_path:
+        engine = SQLEngine(db_path=db_path)
+        engine.execute("CREATE TABLE items (id INT, name VARCHAR(10))")
+        
+        print("\nTesting Batched Inserts\n")
+        
+        # One statement, several rows
+        print("Inserting three rows with one INSERT...")
+        result = engine.execute(
+            "INSERT INTO items (id, name) VALUES (1, 'pen'), (2, 'ink'), (3, 'pad')"
+        )
+        print(result)
+        assert result.rows_affected == 3
+        
+        # A multi-row INSERT with a bad row inserts nothing
+        print("\nInserting two rows, one of them invalid...")
+        result = engine.execute("INSERT INTO items (id, name) VALUES (4, 'cap'), ('x', 'bad')")
+        print(result)
+        assert result.message.startswith("Error")
+        assert engine.execute("SELECT id FROM items").row_count == 3
+        
+        # Consecutive INSERTs run as one batch
+        print("\nRunning a batch of INSERTs with execute_many...")
+        results = engine.execute_many([
+            "INSERT INTO items (id, name) VALUES (4, 'cap')",
+            "INSERT INTO items (id, name) VALUES (5, 'nib'), (6, 'tip')",
+            "SELECT name FROM items WHERE id > 3",
+        ])
+        for result in results:
+            print(result)
+        assert [r.rows_affected for r in results[:2]] == [1, 2]
+        assert [row['name'] for row in results[2].rows] == ['cap', 'nib', 'tip']
+        
+        # When a row in a batch is invalid, every statement reports its own
+        # result and the valid ones are inserted exactly once
+        print("\nRunning a batch with an invalid statement...")
+        results = engine.execute_many([
+            "INSERT INTO items (id, name) VALUES (7, 'ok')",
+            "INSERT INTO items (id, name) VALUES (8, 'much too long')",
+            "INSERT INTO items (id, name) VALUES (9, 'ok')",
+        ])
+        for result in results:
+            print(f"  {result.message}")
+        assert results[1].message.startswith("Error")
+        result = engine.execute("SELECT id FROM items WHERE name = 'ok'")
+        assert [row['id'] for row in result.rows] == [7, 9]
+        assert engine.execute("SELECT id FROM items").row_count == 8
+    print()
+
+
+def test_persistence():
+    """Test that inserted rows survive reopening the database"""
+    
+    with tempfile.TemporaryDirectory() as db_path:
+        engine = SQLEngine(db_path=db_path)
+        engine.execute("CREATE TABLE notes (id INT, text VARCHAR(20))")
+        engine.execute("INSERT INTO notes (id, text) VALUES (1, 'first')")
+        engine.execute("INSERT INTO notes (id, text) VALUES (2, 'second'), (3, 'third')")
+        
+        print("\nTesting Persistence\n")
+        
+        # The rows are in the insert log; a new engine replays it
+        print("Reopening the database...")
+        result = SQLEngine(db_path=db_path).execute("SELECT * FROM notes")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 2, 3]
+        
+        # A crash while appending can leave half a line at the end of the
+        # log; it is dropped, and later inserts still load
+        print("\nReopening after a partial write to the insert log...")
+        log_path = os.path.join(db_path, 'notes.jsonl')
+        with open(log_path, 'ab') as f:
+            f.write(b'{"id": 4, "te')
+        engine = SQLEngine(db_path=db_path)
+        engine.execute("INSERT INTO notes (id, text) VALUES (5, 'fifth')")
+        result = SQLEngine(db_path=db_path).execute("SELECT id FROM notes")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 2, 3, 5]
+        
+        # A crash after saving a snapshot but before removing the old log
+        # must not replay the log's rows a second time
+        print("\nReopening with a log left over from before the last save...")
+        with open(log_path, 'rb') as f:
+            old_log = f.read()
+        engine.storage.flush()
+        with open(log_path, 'wb') as f:
+            f.write(old_log)
+        engine = SQLEngine(db_path=db_path)
+        result = engine.execute("SELECT id FROM notes")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 2, 3, 5]
+        engine.execute("INSERT INTO notes (id, text) VALUES (6, 'sixth')")
+        result = SQLEngine(db_path=db_path).execute("SELECT id FROM notes")
+        assert [row['id'] for row in result.rows] == [1, 2, 3, 5, 6]
+        
+        # A write that fails partway (here, the disk filling up) leaves
+        # nothing of the failed rows in the log, whether it stopped inside a
+        # line or right after one, so retrying the insert does not duplicate
+        print("\nInserting while the disk is full...")
+        cuts = [lambda data: len(data) // 2, lambda data: data.index(b'\n') + 1]
+        for cut in cuts:
+            storage.open = lambda path, mode: FullDiskFile(open(path, mode), cut)
+            try:
+                result = engine.execute("INSERT INTO notes (id, text) VALUES (7, 'seventh'), (8, 'eighth')")
+            finally:
+                del storage.open
+            print(f"  {result.message}")
+            assert result.message.startswith("Error")
+            result = SQLEngine(db_path=db_path).execute("SELECT id FROM notes")
+            assert [row['id'] for row in result.rows] == [1, 2, 3, 5, 6]
+        engine.execute("INSERT INTO notes (id, text) VALUES (7, 'seventh'), (8, 'eighth')")
+        result = SQLEngine(db_path=db_path).execute("SELECT id FROM notes")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 2, 3, 5, 6, 7, 8]
+        
+        # A log that cannot be read keeps failing loudly; the table is never
+        # served without its logged rows, and the log is never overwritten
+        print("\nReopening with a corrupt line in the insert log...")
+        with open(log_path, 'ab') as f:
+            f.write(b'{"id": oops}\n')
+        with open(log_path, 'rb') as f:
+            corrupt_log = f.read()
+        engine = SQLEngine(db_path=db_path)
+        for sql in ["SELECT id FROM notes", "SELECT id FROM notes",
+                    "INSERT INTO notes (id, text) VALUES (9, 'ninth')"]:
+            result = engine.execute(sql)
+            print(f"  {result.message}")
+            assert result.message.startswith("Error")
+        with open(log_path, 'rb') as f:
+            assert f.read() == corrupt_log
+    print()
+
+
+def test_indexes():
+    """Test equality lookups through a hash index"""
+    
+    with tempfile.TemporaryDirectory() as db_path:
+        engine = SQLEngine(db_path=db_path)
+        engine.execute("CREATE TABLE staff (id INT, dept VARCHAR(20), age INT)")
+        engine.execute(
+            "INSERT INTO staff (id, dept, age) VALUES "
+            "(1, 'Eng', 30), (2, 'Sales', 41), (3, 'Eng', 25), (4, 'HR', 35)"
+        )
+        
+        print("\nTesting Indexes\n")
+        
+        print("Creating an index on 'dept'...")
+        engine.create_index('staff', 'dept')
+        print(engine.describe_table('staff'))
+        
+        # Rows inserted after the index is created are indexed as well
+        engine.execute("INSERT INTO staff (id, dept, age) VALUES (5, 'Eng', 45)")
+        
+        print("\nFinding Eng staff older than 28 through the index:")
+        result = engine.execute("SELECT id, age FROM staff WHERE dept = 'Eng' AND age > 28")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 5]
+        
+        result = engine.execute("SELECT id FROM staff WHERE dept = 'Ops'")
+        assert result.row_count == 0
+        result = engine.execute("SELECT id FROM staff WHERE dept = 'HR' OR age < 30")
+        assert [row['id'] for row in result.rows] == [3, 4]
+        
+        print("\nIndexing a column that does not exist...")
+        try:
+            engine.create_index('staff', 'salary')
+        except ValueError as e:
+            print(f"Error: {e}")
+        else:
+            raise AssertionError("create_index accepted an unknown column")
+        
+        # The index is rebuilt when the table is loaded again
+        print("\nReopening the database...")
+        engine = SQLEngine(db_path=db_path)
+        table = engine.storage.get_table('staff')
+        assert list(table.indexes) == ['dept']
+        result = engine.execute("SELECT id FROM staff WHERE dept = 'Eng'")
+        print(result)
+        assert [row['id'] for row in result.rows] == [1, 3, 5]
+    print()
+
+
+def test_bulk_insert():
+    """Test loading rows column by column with insert_columns"""
+    
+    with tempfile.TemporaryDirectory() as db_path:
+        engine = SQLEngine(db_path=db_path)
+        engine.execute("CREATE TABLE readings (id INT, sensor VARCHAR(5), value INT)")
+        
+        print("\nTesting Bulk Insert\n")
+        
+        print("Loading 1000 rows column by column...")
+        count = engine.insert_columns('readings', {
+            'id': list(range(1000)),
+            'sensor': ['s%d' % (i % 4) for i in range(1000)],
+            'value': [i * 3 for i in range(1000)],
+        })
+        print(f"{count} rows inserted into 'readings'")
+        assert count == 1000
+        result = engine.execute("SELECT id, value FROM readings WHERE sensor = 's1' AND id < 10")
+        print(result)
+        assert [row['value'] for row in result.rows] == [3, 15, 27]
+        
+        # Invalid batches are rejected as a whole
+        bad_batches = [
+            ("columns of different lengths", {'id': [1000, 1001], 'value': [1]}),
+            ("a value of the wrong type", {'id': [1000, 'x'], 'value': [1, 2]}),
+            ("a string that is too long", {'id': [1000], 'sensor': ['toolong']}),
+            ("an unknown column", {'id': [1000], 'reading': [1]}),
+        ]
+        for description, columns in bad_batches:
+            print(f"\nLoading a batch with {description}...")
+            try:
+                engine.insert_columns('readings', columns)
+            except ValueError as e:
+                print(f"Error: {e}")
+            else:
+                raise AssertionError(f"insert_columns accepted {description}")
+        assert engine.execute("SELECT id FROM readings").row_count == 1000
+        
+        # Columns left out have no value; the rows survive a reopen
+        engine.insert_columns('readings', {'id': [1000], 'sensor': ['s9']})
+        result = SQLEngine(db_path=db_path).execute("SELECT * FROM readings WHERE id >= 999")
+        print()
+        print(result)
+        assert result.rows[1] == {'id': 1000, 'sensor': 's9', 'value': None}
+    print()
+
+
 if __name__ == '__main__':
     test_basic_operations()
     test_data_validation()
+    test_batched_inserts()
+    test_persistence()
+    test_indexes()
+    test_bulk_insert()
     
     print("\n" + "=" * 60)
     print("All tests completed!")